@@ -19,8 +19,10 @@ from sortedcontainers import (
     SortedSet,
 )
 
+from .caches import LFUCache, LRUCache, TTLCache
+from .dense import DenseIndexableDict, DenseIndexableSet
 from .nearestdict import NearestDict
-from .ordereddict import OrderedDict
+from .ordereddict import CompactOrderedDict, OrderedDict
 from .recipes import (
     IndexableDict,
     IndexableSet,
@@ -31,9 +33,14 @@ from .recipes import (
 )
 
 __all__ = [
+    'CompactOrderedDict',
+    'DenseIndexableDict',
+    'DenseIndexableSet',
     'IndexableDict',
     'IndexableSet',
     'ItemSortedDict',
+    'LFUCache',
+    'LRUCache',
     'NearestDict',
     'OrderedDict',
     'OrderedSet',
@@ -42,6 +49,7 @@ __all__ = [
     'SortedList',
     'SortedListWithKey',
     'SortedSet',
+    'TTLCache',
     'ValueSortedDict',
 ]
 
@@ -0,0 +1,379 @@
+"""Bounded cache implementations.
+
+Caches are mappings with a maximum size that evict items according to a
+policy when full. Each keeps its items ordered by that policy so the
+item at any position in eviction order is available by index.
+
+"""
+
+import time
+from abc import abstractmethod
+from collections import abc
+
+from sortedcontainers.sortedlist import recursive_repr
+
+from .ordereddict import OrderedDict
+from .recipes import ValueSortedDict
+
+
+class _ItemsView(abc.ItemsView):
+    "Cache items view that does not count as cache access."
+    # noqa pylint: disable=too-few-public-methods,protected-access
+    def __iter__(self):
+        _data = self._mapping._data
+        for key in self._mapping:
+            yield key, _data[key]
+
+
+class _ValuesView(abc.ValuesView):
+    "Cache values view that does not count as cache access."
+    # noqa pylint: disable=too-few-public-methods,protected-access
+    def __iter__(self):
+        _data = self._mapping._data
+        for key in self._mapping:
+            yield _data[key]
+
+
+class _Cache(abc.MutableMapping):
+    """Base class for bounded caches.
+
+    Subclasses store items in `_data` and implement `_lookup`, `_insert`,
+    `_pop_victim` and the abstract mapping methods.
+
+    """
+
+    # pylint: disable=abstract-method
+    _data: dict
+
+    def __init__(self, maxsize, on_evict):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @abstractmethod
+    def _lookup(self, key):
+        "Return value for key and mark it as used."
+
+    @abstractmethod
+    def _insert(self, key, value):
+        "Store (key, value) item pair and mark it as used."
+
+    @abstractmethod
+    def _pop_victim(self):
+        "Remove and return (key, value) item pair next in eviction order."
+
+    def __getitem__(self, key):
+        "``cache[key]`` -- counts as a hit or miss."
+        try:
+            value = self._lookup(key)
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        "``cache[key] = value`` -- evicts an item when full."
+        if key not in self:
+            while len(self._data) >= self.maxsize:
+                self._evicted(*self._pop_victim())
+        self._insert(key, value)
+
+    def __contains__(self, key):
+        "``key in cache`` -- does not count as a hit or miss."
+        return key in self._data
+
+    def _evicted(self, key, value):
+        "Record eviction of (key, value) item pair."
+        self.evictions += 1
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def popitem(self):
+        """Remove and return the (key, value) item pair next in eviction
+        order. Raise KeyError if the cache is empty.
+
+        """
+        if not self:
+            raise KeyError('popitem(): cache is empty')
+        return self._pop_victim()
+
+    def get_many(self, keys):
+        """Return dict of cached items for keys.
+
+        Missing keys are left out of the result. Each key counts as a hit or
+        miss.
+
+        """
+        result = {}
+        for key in keys:
+            try:
+                result[key] = self[key]
+            except KeyError:
+                pass
+        return result
+
+    def set_many(self, pairs):
+        "Set items from mapping or iterable of (key, value) pairs."
+        if isinstance(pairs, abc.Mapping):
+            pairs = pairs.items()
+        for key, value in pairs:
+            self[key] = value
+
+    def items(self):
+        "Return view of cache items in eviction order."
+        return _ItemsView(self)
+
+    def values(self):
+        "Return view of cache values in eviction order."
+        return _ValuesView(self)
+
+    @recursive_repr()
+    def __repr__(self):
+        "Text representation of cache."
+        name = type(self).__name__
+        return f'{name}({list(self.items())!r}, maxsize={self.maxsize!r})'
+
+
+class LRUCache(_Cache):
+    """Least-recently-used cache.
+
+    When full, the item that was least recently read or written is evicted.
+    Iteration and :meth:`LRUCache.peekitem` run from least to most recently
+    used. For example::
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache['a'] = 1
+        >>> cache['b'] = 2
+        >>> cache['a']
+        1
+        >>> cache['c'] = 3
+        >>> list(cache)
+        ['a', 'c']
+        >>> cache.peekitem(0)
+        ('a', 1)
+
+    Optional `on_evict` callable is called with the key and value of each
+    evicted item. Counters `hits`, `misses` and `evictions` record cache
+    access.
+
+    """
+
+    def __init__(self, maxsize=128, on_evict=None):
+        super().__init__(maxsize, on_evict)
+        self._data = OrderedDict()
+
+    def _lookup(self, key):
+        value = self._data[key]
+        self._data.move_to_end(key)
+        return value
+
+    def _insert(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+    def _pop_victim(self):
+        return self._data.popitem(last=False)
+
+    def __delitem__(self, key):
+        "``del cache[key]``"
+        del self._data[key]
+
+    def __iter__(self):
+        "``iter(cache)``"
+        return iter(self._data)
+
+    def __len__(self):
+        "``len(cache)``"
+        return len(self._data)
+
+    def clear(self):
+        "Remove all items from cache."
+        self._data.clear()
+
+    def peekitem(self, index=-1):
+        """Return (key, value) item pair at index in recency order.
+
+        Index 0 is the least recently used item and -1 (the default) is the
+        most recently used. The item is not marked as used.
+
+        """
+        return self._data.items()[index]
+
+
+class LFUCache(_Cache):
+    """Least-frequently-used cache.
+
+    When full, the item with the fewest reads and writes is evicted. Ties are
+    broken by evicting the least recently used. Iteration and
+    :meth:`LFUCache.peekitem` run from least to most frequently used. For
+    example::
+
+        >>> cache = LFUCache(maxsize=2)
+        >>> cache['a'] = 1
+        >>> cache['b'] = 2
+        >>> cache['a']
+        1
+        >>> cache['c'] = 3
+        >>> list(cache)
+        ['c', 'a']
+        >>> cache.frequency('a')
+        2
+
+    Optional `on_evict` callable is called with the key and value of each
+    evicted item. Counters `hits`, `misses` and `evictions` record cache
+    access.
+
+    """
+
+    def __init__(self, maxsize=128, on_evict=None):
+        super().__init__(maxsize, on_evict)
+        self._data = {}
+        self._counts = ValueSortedDict()
+
+    def _lookup(self, key):
+        value = self._data[key]
+        self._counts.increment(key)
+        return value
+
+    def _insert(self, key, value):
+        self._counts.increment(key)
+        self._data[key] = value
+
+    def _pop_victim(self):
+        key, _ = self._counts.popitem(0)
+        return key, self._data.pop(key)
+
+    def __delitem__(self, key):
+        "``del cache[key]``"
+        del self._data[key]
+        del self._counts[key]
+
+    def __iter__(self):
+        "``iter(cache)``"
+        return iter(self._counts)
+
+    def __len__(self):
+        "``len(cache)``"
+        return len(self._data)
+
+    def clear(self):
+        "Remove all items from cache."
+        self._data.clear()
+        self._counts.clear()
+
+    def frequency(self, key):
+        "Return number of times key was used. Raise KeyError if not found."
+        return self._counts[key]
+
+    def peekitem(self, index=-1):
+        """Return (key, value) item pair at index in frequency order.
+
+        Index 0 is the least frequently used item and -1 (the default) is the
+        most frequently used. The item is not marked as used.
+
+        """
+        key = self._counts.keys()[index]
+        return key, self._data[key]
+
+
+class TTLCache(_Cache):
+    """Time-to-live cache.
+
+    Items expire `ttl` seconds after they were last written. Expired items are
+    evicted on the next access. When full, the item closest to expiring is
+    evicted. Iteration and :meth:`TTLCache.peekitem` run from soonest to
+    latest expiration. For example::
+
+        >>> now = [0]
+        >>> cache = TTLCache(maxsize=10, ttl=5, timer=lambda: now[0])
+        >>> cache['a'] = 1
+        >>> now[0] = 3
+        >>> cache['b'] = 2
+        >>> now[0] = 6
+        >>> list(cache)
+        ['b']
+
+    Optional `timer` callable returns the current time. (Default:
+    :func:`time.monotonic`)
+
+    Optional `on_evict` callable is called with the key and value of each
+    evicted or expired item. Counters `hits`, `misses` and `evictions` record
+    cache access; expired items count as evictions.
+
+    """
+
+    def __init__(
+        self, maxsize=128, ttl=600, timer=time.monotonic, on_evict=None
+    ):
+        # pylint: disable=too-many-arguments
+        super().__init__(maxsize, on_evict)
+        self.ttl = ttl
+        self.timer = timer
+        self._data = {}
+        self._expires = ValueSortedDict()
+
+    def expire(self):
+        "Evict all expired items and return their number."
+        _expires = self._expires
+        expired = _expires.count_values_between(maximum=self.timer())
+        if expired:
+            keys_view = _expires.keys()
+            keys = keys_view[:expired]
+            del keys_view[:expired]
+            _data = self._data
+            for key in keys:
+                self._evicted(key, _data.pop(key))
+        return expired
+
+    def _lookup(self, key):
+        self.expire()
+        return self._data[key]
+
+    def _insert(self, key, value):
+        self._expires[key] = self.timer() + self.ttl
+        self._data[key] = value
+
+    def _pop_victim(self):
+        key, _ = self._expires.popitem(0)
+        return key, self._data.pop(key)
+
+    def __contains__(self, key):
+        "``key in cache`` -- does not count as a hit or miss."
+        self.expire()
+        return key in self._data
+
+    def __delitem__(self, key):
+        "``del cache[key]``"
+        del self._data[key]
+        del self._expires[key]
+
+    def __iter__(self):
+        "``iter(cache)``"
+        self.expire()
+        return iter(self._expires)
+
+    def __len__(self):
+        "``len(cache)``"
+        self.expire()
+        return len(self._data)
+
+    def clear(self):
+        "Remove all items from cache."
+        self._data.clear()
+        self._expires.clear()
+
+    def peekitem(self, index=-1):
+        """Return (key, value) item pair at index in expiration order.
+
+        Index 0 is the item closest to expiring and -1 (the default) is the
+        most recently written.
+
+        """
+        self.expire()
+        key = self._expires.keys()[index]
+        return key, self._data[key]
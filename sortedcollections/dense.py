@@ -0,0 +1,375 @@
+"""Dense indexable dictionary and set implementations.
+
+"""
+
+import random
+from collections import abc
+from heapq import nlargest
+from math import log
+
+from .ordereddict import _MappingMixin
+from .recipes import _SampleMixin
+
+
+class DenseIndexableDict(_MappingMixin, _SampleMixin, dict):
+    """Dictionary that supports O(1) numerical indexing.
+
+    Keys are numerically indexable using dict views. For example::
+
+        >>> dense_dict = DenseIndexableDict.fromkeys('abcde')
+        >>> keys = dense_dict.keys()
+        >>> sorted(keys[:]) == ['a', 'b', 'c', 'd', 'e']
+        True
+        >>> del dense_dict['b']
+        >>> keys[1]
+        'e'
+
+    Keys are stored in a dense list with a dict mapping each key to its
+    position. Deleting a key moves the last key into its place, so indexing,
+    insertion and deletion are all O(1) but the order of keys is arbitrary and
+    changes on deletion. Use :class:`IndexableDict` for an order that depends
+    only on the keys.
+
+    Random keys are drawn with `choice` and `sample`, or weighted by their
+    values with `weighted_choice` and `weighted_sample`. The first weighted
+    draw builds a prefix-sum (Fenwick) tree of the values by position which
+    is then maintained on every change, so weighted draws are O(log n).
+    Values must be non-negative numbers while the tree is maintained.
+
+    """
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, *args, **kwargs):
+        self._keys = []
+        self._positions = {}
+        self._tree = None
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value, dict_setitem=dict.__setitem__):
+        "``dense_dict[key] = value``"
+        if key in self:
+            if self._tree is not None:
+                self._tree_add(self._positions[key], value - self[key], value)
+        else:
+            if self._tree is not None:
+                self._tree_append(value)
+            self._positions[key] = len(self._keys)
+            self._keys.append(key)
+        dict_setitem(self, key, value)
+
+    def __delitem__(self, key, dict_delitem=dict.__delitem__):
+        "``del dense_dict[key]`` -- moves the last key into its position."
+        _keys = self._keys
+        _tree = self._tree
+        pos = self._positions.pop(key)
+        last = _keys.pop()
+        if pos < len(_keys):
+            if _tree is not None:
+                self._tree_add(pos, self[last] - self[key])
+            _keys[pos] = last
+            self._positions[last] = pos
+        if _tree is not None:
+            _tree.pop()
+        dict_delitem(self, key)
+
+    def __iter__(self):
+        "``iter(dense_dict)``"
+        return iter(self._keys)
+
+    def __reversed__(self):
+        "``reversed(dense_dict)``"
+        return reversed(self._keys)
+
+    def clear(self, dict_clear=dict.clear):
+        "Remove all items from mapping."
+        dict_clear(self)
+        del self._keys[:]
+        self._positions.clear()
+        self._tree = None
+
+    def _population(self):
+        return self._keys
+
+    def _weight_tree(self):
+        "Return Fenwick tree of values by position, building it if needed."
+        if self._tree is None:
+            tree = [0]
+            tree.extend(map(self.__getitem__, self._keys))
+            if any(weight < 0 for weight in tree):
+                raise ValueError('weights must be non-negative')
+            size = len(tree)
+            for pos in range(1, size):
+                parent = pos + (pos & -pos)
+                if parent < size:
+                    tree[parent] += tree[pos]
+            self._tree = tree
+        return self._tree
+
+    def _tree_add(self, pos, delta, weight=0):
+        "Add `delta` to weight at position `pos`, checking new `weight`."
+        if weight < 0:
+            raise ValueError('weights must be non-negative')
+        _tree = self._tree
+        size = len(_tree)
+        pos += 1
+        while pos < size:
+            _tree[pos] += delta
+            pos += pos & -pos
+
+    def _tree_append(self, weight):
+        "Append `weight` to the end of the tree."
+        if weight < 0:
+            raise ValueError('weights must be non-negative')
+        _tree = self._tree
+        pos = len(_tree)
+        child = pos - 1
+        lowest = pos - (pos & -pos)
+        while child > lowest:
+            weight += _tree[child]
+            child -= child & -child
+        _tree.append(weight)
+
+    def _tree_total(self):
+        "Return sum of weights in the tree."
+        _tree = self._tree
+        total = 0
+        pos = len(_tree) - 1
+        while pos:
+            total += _tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _tree_find(self, target):
+        "Return first position where the sum of weights exceeds `target`."
+        _tree = self._tree
+        size = len(_tree)
+        pos = 0
+        step = 1 << (size - 1).bit_length()
+        while step:
+            child = pos + step
+            if child < size and _tree[child] <= target:
+                pos = child
+                target -= _tree[child]
+            step >>= 1
+        return min(pos, size - 2)
+
+    def weighted_choice(self, rng=None):
+        """Return a random key with probability proportional to its value.
+
+        Draws use `rng`, which defaults to the :mod:`random` module. Raise
+        IndexError if the mapping is empty and ValueError if the values do not
+        sum to a positive number.
+
+        >>> dense_dict = DenseIndexableDict(a=0, b=1, c=0)
+        >>> dense_dict.weighted_choice()
+        'b'
+
+        """
+        if not self:
+            raise IndexError('Cannot choose from an empty sequence')
+        self._weight_tree()
+        total = self._tree_total()
+        # Negated comparisons also reject a NaN total.
+        # pylint: disable=unnecessary-negation
+        if not total > 0:
+            raise ValueError('total of weights must be positive')
+        rng = random if rng is None else rng
+        return self._keys[self._tree_find(rng.random() * total)]
+
+    def weighted_sample(self, k, rng=None):
+        """Return list of `k` unique keys chosen with probability proportional
+        to their values.
+
+        Draws use `rng`, which defaults to the :mod:`random` module. Each key
+        is drawn from the keys not yet chosen, like drawing weighted balls
+        without replacement. Small samples walk the prefix-sum tree, large
+        samples rank all keys at once by exponential keys. Raise ValueError if
+        fewer than `k` keys have positive values.
+
+        >>> dense_dict = DenseIndexableDict(a=1, b=0, c=2)
+        >>> sorted(dense_dict.weighted_sample(2))
+        ['a', 'c']
+
+        """
+        rng = random if rng is None else rng
+        _keys = self._keys
+        size = len(_keys)
+        if k < 0:
+            raise ValueError('sample size must be non-negative')
+        if k > size // 8:
+            weights = list(map(self.__getitem__, _keys))
+            positions = [pos for pos in range(size) if weights[pos] > 0]
+            if k > len(positions):
+                raise ValueError('sample larger than positive weights')
+            scores = {
+                pos: log(1.0 - rng.random()) / weights[pos]
+                for pos in positions
+            }
+            positions = nlargest(k, positions, key=scores.__getitem__)
+            return [_keys[pos] for pos in positions]
+        self._weight_tree()
+        drawn = {}
+        # pylint: disable=unnecessary-negation
+        try:
+            for _ in range(k):
+                total = self._tree_total()
+                pos = self._tree_find(rng.random() * total)
+                weight = self[_keys[pos]]
+                if not total > 0 or pos in drawn or not weight > 0:
+                    raise ValueError('sample larger than positive weights')
+                self._tree_add(pos, -weight)
+                drawn[pos] = weight
+        finally:
+            for pos, weight in drawn.items():
+                self._tree_add(pos, weight)
+        return [_keys[pos] for pos in drawn]
+
+    def _key_at(self, index):
+        "Return key at position index."
+        return self._keys[index]
+
+    def _iter_keys(self, positions):
+        "Return iterator of keys at positions in range."
+        return map(self._keys.__getitem__, positions)
+
+    def index(self, key):
+        "Return position of key. Raise KeyError if key is not found."
+        return self._positions[key]
+
+    def popitem(self, index=-1):
+        """Remove and return (key, value) item pair at index.
+
+        Raise KeyError if the mapping is empty and IndexError if index is out
+        of range.
+
+        """
+        if not self:
+            raise KeyError('popitem(): dictionary is empty')
+        key = self._keys[index]
+        return key, self.pop(key)
+
+    def __reduce__(self):
+        "Support for pickling serialization."
+        return (self.__class__, (list(self.items()),))
+
+    def _check(self):
+        "Check consistency of internal member variables."
+        keys = self._keys
+        assert len(keys) == len(self._positions) == len(self)
+        for pos, key in enumerate(keys):
+            assert self._positions[key] == pos
+            assert key in self
+        if self._tree is not None:
+            tree = self._tree
+            self._tree = None
+            assert self._weight_tree() == tree
+
+
+class DenseIndexableSet(_SampleMixin, abc.MutableSet, abc.Sequence):
+    """Set that supports O(1) numerical indexing.
+
+    Values are numerically indexable. For example::
+
+        >>> dense_set = DenseIndexableSet('abcde')
+        >>> sorted(dense_set[:]) == ['a', 'b', 'c', 'd', 'e']
+        True
+
+    Like :class:`DenseIndexableDict`, values are stored in a dense list and
+    removal moves the last value into the removed position. Indexing, adding
+    and removing are O(1), so `choice` and :func:`random.choice` are O(1), but
+    the order of values is arbitrary.
+
+    `DenseIndexableSet` implements the sequence abstract base class.
+
+    """
+
+    # pylint: disable=too-many-ancestors
+    def __init__(self, iterable=()):
+        self._values = []
+        self._positions = {}
+        for value in iterable:
+            self.add(value)
+
+    def _population(self):
+        return self._values
+
+    def __contains__(self, value):
+        "``value in dense_set``"
+        return value in self._positions
+
+    def __iter__(self):
+        "``iter(dense_set)``"
+        return iter(self._values)
+
+    def __reversed__(self):
+        "``reversed(dense_set)``"
+        return reversed(self._values)
+
+    def __getitem__(self, index):
+        "``dense_set[index]`` -> value; lookup value at index."
+        return self._values[index]
+
+    def __len__(self):
+        "``len(dense_set)``"
+        return len(self._values)
+
+    def count(self, value):
+        "Return number of occurrences of value."
+        return int(value in self._positions)
+
+    def index(self, value):
+        "Return index of value."
+        # pylint: disable=arguments-differ
+        try:
+            return self._positions[value]
+        except KeyError:
+            raise ValueError(f'{value!r} is not in {type(self).__name__}')
+
+    def add(self, value):
+        "Add value to set."
+        if value not in self._positions:
+            self._positions[value] = len(self._values)
+            self._values.append(value)
+
+    def discard(self, value):
+        "Remove value from set if it is a member."
+        pos = self._positions.pop(value, None)
+        if pos is not None:
+            _values = self._values
+            last = _values.pop()
+            if pos < len(_values):
+                _values[pos] = last
+                self._positions[last] = pos
+
+    def pop(self, index=-1):
+        """Remove and return value at index (default last).
+
+        Raise IndexError if set is empty or index is out of range.
+
+        """
+        # pylint: disable=arguments-differ
+        if not self._values:
+            raise IndexError('pop from empty set')
+        value = self._values[index]
+        self.discard(value)
+        return value
+
+    def clear(self):
+        "Remove all values from set."
+        del self._values[:]
+        self._positions.clear()
+
+    def __reduce__(self):
+        return self.__class__, (list(self),)
+
+    def __repr__(self):
+        "Text representation of set."
+        return f'{type(self).__name__}({list(self)!r})'
+
+    __str__ = __repr__
+
+    def _check(self):
+        "Check consistency of internal member variables."
+        assert len(self._values) == len(self._positions)
+        for pos, value in enumerate(self._values):
+            assert self._positions[value] == pos
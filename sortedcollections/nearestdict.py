@@ -4,10 +4,118 @@ One primary use case for this data structure is storing data by a
 `datetime.datetime` or `float` key.
 """
 
+from bisect import bisect_left
+from functools import partial
+from itertools import islice
+
 from sortedcontainers import SortedDict
 
+from .recipes import _FromSortedMixin, _PickleMixin, _RangeDeleteMixin
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore
+
+NONE = object()
+NONE_FOUND = object()
+
+
+def _gallop(values, value, lo):
+    """Return ``bisect_left(values, value)`` searching forward from `lo`.
+
+    All of ``values[:lo]`` must be less than `value`. Steps double from `lo`
+    so the search costs O(log d) for distance d.
+    """
+    size = len(values)
+    hi = lo
+    step = 1
+    while hi < size and values[hi] < value:
+        lo = hi + 1
+        hi += step
+        step <<= 1
+    return bisect_left(values, value, lo, min(hi, size))
+
+
+class NearestCursor:
+    """Cursor for nearest-key lookups with increasing requests.
+
+    Created by :meth:`NearestDict.cursor`. The cursor remembers the block and
+    offset of its last lookup and gallops forward from there, so a sequence
+    of increasing requests costs amortized O(1) per lookup.
+
+    The remembered position is only a hint. Before using it, the cursor checks
+    that every key before it is still less than the request. When a mutation
+    of the dict or a smaller request invalidates the hint, the lookup falls
+    back to a full bisect.
+
+    >>> d = NearestDict({1.0: 'foo', 5.0: 'bar'})
+    >>> cursor = d.cursor()
+    >>> [cursor[request] for request in (0.0, 2.0, 4.0, 6.0)]
+    ['foo', 'foo', 'bar', 'bar']
+    """
+
+    # pylint: disable=protected-access
+    def __init__(self, nearest_dict):
+        self._dict = nearest_dict
+        self._pos = 0
+        self._block = None
+        self._idx = 0
+
+    def nearest_key(self, request):
+        """Return nearest-key to `request`, like :meth:`NearestDict.nearest_key`.
+
+        :param request: nearest-key lookup value
+        :return: key nearest to `request`, respecting `rounding`
+        :raises KeyError: if no appropriate key can be found
+        """
+        _list = self._dict._list
+        _lists = _list._lists
+        _maxes = _list._maxes
+
+        if not _maxes:
+            raise KeyError('NearestDict is empty')
+
+        pos = self._pos
+        if pos > len(_maxes) or pos and not _maxes[pos - 1] < request:
+            pos = 0
+        pos = _gallop(_maxes, request, pos)
+
+        if pos == len(_maxes):
+            below = _maxes[-1]
+            above = NONE
+        else:
+            keys = _lists[pos]
+            idx = self._idx
+            valid = keys is self._block and idx <= len(keys)
+            if not valid or idx and not keys[idx - 1] < request:
+                idx = 0
+            idx = _gallop(keys, request, idx)
+            above = keys[idx]
+            if idx:
+                below = keys[idx - 1]
+            else:
+                below = _maxes[pos - 1] if pos else NONE
+            self._block = keys
+            self._idx = idx
+
+        self._pos = pos
+        return self._dict._resolve(request, below, above)
+
+    def __getitem__(self, request):
+        """Return item corresponding to :meth:`NearestCursor.nearest_key`.
+
+        :param request: nearest-key lookup value
+        :return: item corresponding to key nearest `request`
+        :raises KeyError: if no appropriate item can be found
+        """
+        key = self.nearest_key(request)
+        return dict.__getitem__(self._dict, key)
+
 
-class NearestDict(SortedDict):
+class NearestDict(
+    _FromSortedMixin, _PickleMixin, _RangeDeleteMixin, SortedDict
+):
     """A dict using nearest-key lookup.
 
     A :class:`SortedDict` subclass that uses nearest-key lookup instead of
@@ -22,6 +130,16 @@ class NearestDict(SortedDict):
     Additional methods:
 
     * :meth:`NearestDict.nearest_key`
+    * :meth:`NearestDict.nearest_keys`
+    * :meth:`NearestDict.get_many`
+    * :meth:`NearestDict.k_nearest`
+    * :meth:`NearestDict.within`
+    * :meth:`NearestDict.cursor`
+    * :meth:`NearestDict.interpolate`
+    * :meth:`NearestDict.interpolate_many`
+    * :meth:`NearestDict.delete_range`
+    * :meth:`NearestDict.truncate_before`
+    * :meth:`NearestDict.truncate_after`
 
     Example usage:
 
@@ -54,6 +172,9 @@ class NearestDict(SortedDict):
         self.rounding = kwargs.pop('rounding', self.NEAREST)
         super().__init__(*args, **kwargs)
 
+    def _pickle_factory(self):
+        return partial(self.__class__, rounding=self.rounding)
+
     def nearest_key(self, request):
         """Return nearest-key to `request`, respecting `self.rounding`.
 
@@ -75,28 +196,350 @@ class NearestDict(SortedDict):
         :return: key nearest to `request`, respecting `rounding`
         :raises KeyError: if no appropriate key can be found
         """
-        key_list = self.keys()
+        below, above = self._neighbors(request)
+        return self._resolve(request, below, above)
+
+    def _neighbors(self, request):
+        """Return (below, above) pair of keys around `request`.
 
-        if not key_list:
+        `below` is the greatest key less than `request` and `above` is the
+        least key greater than or equal to `request`. Either may be `NONE`.
+
+        :raises KeyError: if the dict is empty
+        """
+        _list = self._list
+
+        if not _list:
             raise KeyError('NearestDict is empty')
 
-        index = self.bisect_left(request)
+        index = _list.bisect_left(request)
+        below = _list[index - 1] if index else NONE
+        above = _list[index] if index < len(_list) else NONE
+        return below, above
+
+    def _sweep(self, requests):
+        """Yield (index, request, below, above) tuples for list `requests`.
+
+        Requests are visited in sorted order in a single sweep over the key
+        blocks. The dict must not be empty.
+        """
+        # pylint: disable=protected-access
+        _list = self._list
+        _lists = _list._lists
+        _maxes = _list._maxes
+        blocks = len(_maxes)
+        last = _maxes[-1]
+        pos = 0
+
+        for index in sorted(range(len(requests)), key=requests.__getitem__):
+            request = requests[index]
+            pos = bisect_left(_maxes, request, pos)
 
-        if index >= len(key_list):
-            if self.rounding == self.NEAREST_NEXT:
+            if pos == blocks:
+                below = last
+                above = NONE
+            else:
+                keys = _lists[pos]
+                idx = bisect_left(keys, request)
+                above = keys[idx]
+                if idx:
+                    below = keys[idx - 1]
+                else:
+                    below = _maxes[pos - 1] if pos else NONE
+
+            yield index, request, below, above
+
+    def _resolve(self, request, below, above):
+        """Return key nearest to `request` given its neighbors.
+
+        `below` is the greatest key less than `request` and `above` is the
+        least key greater than or equal to `request`. Either may be `NONE`.
+        """
+        if above is not NONE and above == request:
+            return above
+        if self.rounding == self.NEAREST_PREV:
+            if below is NONE:
+                raise KeyError(f'No key below {request!r} found')
+            return below
+        if self.rounding == self.NEAREST_NEXT:
+            if above is NONE:
                 raise KeyError(f'No key above {request!r} found')
-            return key_list[index - 1]
-        if key_list[index] == request:
-            return key_list[index]
-        if index == 0 and self.rounding == self.NEAREST_PREV:
-            raise KeyError(f'No key below {request!r} found')
+            return above
+        if above is NONE:
+            return below
+        if below is not NONE and abs(below - request) < abs(above - request):
+            return below
+        return above
+
+    def nearest_keys(self, requests, default=NONE):
+        """Return list of nearest-keys to `requests`, respecting `rounding`.
+
+        Requests are resolved in sorted order in a single sweep over the key
+        blocks. If `default` is given, it replaces keys that cannot be found.
+        Otherwise, raise KeyError.
+
+        If `requests` is a NumPy array, the keys are converted to a float array
+        and the result is a NumPy array computed with
+        :func:`numpy.searchsorted`.
+
+        >>> d = NearestDict({1.0: 'foo', 5.0: 'bar'})
+        >>> d.nearest_keys([6.0, 0.0, 3.5])
+        [5.0, 1.0, 5.0]
+
+        :param requests: iterable of nearest-key lookup values
+        :param default: value for requests without a key (optional)
+        :return: keys nearest to `requests`, respecting `rounding`
+        :raises KeyError: if no appropriate key can be found
+        """
+        if numpy is not None and isinstance(requests, numpy.ndarray):
+            return self._nearest_array(requests, default)
+
+        requests = list(requests)
+        _list = self._list
+        result = [default] * len(requests)
+
+        if not _list:
+            if requests and default is NONE:
+                raise KeyError('NearestDict is empty')
+            return result
+
+        resolve = self._resolve
+
+        for index, request, below, above in self._sweep(requests):
+            try:
+                result[index] = resolve(request, below, above)
+            except KeyError:
+                if default is NONE:
+                    raise
+
+        return result
+
+    def _nearest_array(self, requests, default):
+        "Return NumPy array of nearest-keys to NumPy array `requests`."
+        keys = numpy.fromiter(self._list, dtype=float, count=len(self._list))
+        size = len(keys)
+        index = numpy.searchsorted(keys, requests)
+
+        if size:
+            below = keys[numpy.maximum(index - 1, 0)]
+            above = keys[numpy.minimum(index, size - 1)]
+        else:
+            below = above = numpy.zeros(requests.shape)
+
+        has_below = index > 0
+        has_above = index < size
+        exact = has_above & (above == requests)
+
         if self.rounding == self.NEAREST_PREV:
-            return key_list[index - 1]
+            result = numpy.where(exact, above, below)
+            found = exact | has_below
+        elif self.rounding == self.NEAREST_NEXT:
+            result = above
+            found = has_above
+        else:
+            use_below = has_below & (
+                (numpy.abs(below - requests) < numpy.abs(above - requests))
+                | ~has_above
+            )
+            result = numpy.where(use_below, below, above)
+            found = has_below | has_above
+
+        if not found.all():
+            if default is not NONE:
+                return numpy.where(found, result, default)
+            if not size:
+                raise KeyError('NearestDict is empty')
+            request = requests[~found][0]
+            if self.rounding == self.NEAREST_PREV:
+                raise KeyError(f'No key below {request!r} found')
+            raise KeyError(f'No key above {request!r} found')
+
+        return result
+
+    def get_many(self, requests, default=NONE):
+        """Return list of items corresponding to :meth:`.nearest_keys`.
+
+        NumPy arrays of requests are accepted and resolved as lists.
+
+        >>> d = NearestDict({1.0: 'foo', 5.0: 'bar'})
+        >>> d.get_many([6.0, 0.0, 3.5])
+        ['bar', 'foo', 'bar']
+
+        :param requests: iterable of nearest-key lookup values
+        :param default: value for requests without a key (optional)
+        :return: items corresponding to keys nearest `requests`
+        :raises KeyError: if no appropriate item can be found
+        """
+        if numpy is not None and isinstance(requests, numpy.ndarray):
+            requests = requests.tolist()
+        getitem = super().__getitem__
+        if default is NONE:
+            return list(map(getitem, self.nearest_keys(requests)))
+        keys = self.nearest_keys(requests, NONE_FOUND)
+        return [default if key is NONE_FOUND else getitem(key) for key in keys]
+
+    def k_nearest(self, request, k):
+        """Return list of up to `k` keys nearest to `request`.
+
+        Keys are ordered by distance from `request`, expanding outward from
+        the bisect point in O(log n + k) time. Ties prefer the greater key.
+        With :attr:`NearestDict.NEAREST_PREV` or
+        :attr:`NearestDict.NEAREST_NEXT` rounding, only keys less than or
+        equal to or greater than or equal to `request` are considered.
+
+        >>> d = NearestDict.fromkeys([1, 2, 4, 8, 16])
+        >>> d.k_nearest(5, 3)
+        [4, 2, 8]
+
+        :param request: nearest-key lookup value
+        :param k: maximum number of keys
+        :return: list of keys nearest to `request`
+        """
+        _list = self._list
+
+        if self.rounding == self.NEAREST_PREV:
+            index = _list.bisect_right(request)
+            below = _list.islice(stop=index, reverse=True)
+            return list(islice(below, max(k, 0)))
+
+        index = _list.bisect_left(request)
+        above = _list.islice(start=index)
+
         if self.rounding == self.NEAREST_NEXT:
-            return key_list[index]
-        if abs(key_list[index - 1] - request) < abs(key_list[index] - request):
-            return key_list[index - 1]
-        return key_list[index]
+            return list(islice(above, max(k, 0)))
+
+        below = _list.islice(stop=index, reverse=True)
+        prev_key = next(below, NONE)
+        next_key = next(above, NONE)
+        result = []
+
+        while len(result) < k:
+            if next_key is NONE:
+                if prev_key is NONE:
+                    break
+                use_prev = True
+            elif prev_key is NONE:
+                use_prev = False
+            else:
+                prev_dist = abs(prev_key - request)
+                use_prev = prev_dist < abs(next_key - request)
+
+            if use_prev:
+                result.append(prev_key)
+                prev_key = next(below, NONE)
+            else:
+                result.append(next_key)
+                next_key = next(above, NONE)
+
+        return result
+
+    def within(self, request, radius):
+        """Return sorted list of keys within `radius` of `request`.
+
+        Distances are inclusive. With :attr:`NearestDict.NEAREST_PREV` or
+        :attr:`NearestDict.NEAREST_NEXT` rounding, only keys less than or
+        equal to or greater than or equal to `request` are returned. Runs in
+        O(log n + k) time for k keys returned.
+
+        >>> d = NearestDict.fromkeys([1, 2, 4, 8, 16])
+        >>> d.within(5, 3)
+        [2, 4, 8]
+
+        :param request: nearest-key lookup value
+        :param radius: maximum distance from `request`
+        :return: list of keys within `radius` of `request`
+        """
+        minimum = request - radius
+        maximum = request + radius
+
+        if self.rounding == self.NEAREST_PREV:
+            maximum = request
+        elif self.rounding == self.NEAREST_NEXT:
+            minimum = request
+
+        return list(self.irange(minimum, maximum))
+
+    def _interpolate(self, request, below, above, step):
+        "Return value interpolated at `request` between neighbor keys."
+        getitem = super().__getitem__
+        if above is not NONE and (above == request or below is NONE):
+            return getitem(above)
+        if step or above is NONE:
+            return getitem(below)
+        below_value = getitem(below)
+        fraction = (request - below) / (above - below)
+        return below_value + (getitem(above) - below_value) * fraction
+
+    def interpolate(self, request, step=False):
+        """Return value interpolated at `request` from the surrounding keys.
+
+        Values are interpolated linearly between the keys below and above
+        `request`. If `step` is True, the value of the key less than or equal
+        to `request` is returned instead. Requests outside the range of keys
+        return the value of the first or last key. Keys must support
+        subtraction and division of differences, and values must support
+        arithmetic for linear interpolation.
+
+        >>> d = NearestDict({0.0: 0.0, 10.0: 100.0})
+        >>> d.interpolate(2.5)
+        25.0
+        >>> d.interpolate(2.5, step=True)
+        0.0
+        >>> d.interpolate(20.0)
+        100.0
+
+        :param request: interpolation point
+        :param bool step: step-wise rather than linear (default False)
+        :return: interpolated value
+        :raises KeyError: if the dict is empty
+        """
+        below, above = self._neighbors(request)
+        return self._interpolate(request, below, above, step)
+
+    def interpolate_many(self, requests, step=False):
+        """Return list of values interpolated at `requests`.
+
+        Like :meth:`NearestDict.interpolate` but requests are resolved in a
+        single sorted sweep. If `requests` is a NumPy array, keys and values
+        are converted to float arrays and the result is a NumPy array computed
+        with :func:`numpy.interp` or :func:`numpy.searchsorted`.
+
+        >>> d = NearestDict({0.0: 0.0, 10.0: 100.0})
+        >>> d.interpolate_many([5.0, -1.0, 7.5])
+        [50.0, 0.0, 75.0]
+
+        :param requests: iterable of interpolation points
+        :param bool step: step-wise rather than linear (default False)
+        :return: interpolated values
+        :raises KeyError: if the dict is empty
+        """
+        if not self._list:
+            raise KeyError('NearestDict is empty')
+
+        if numpy is not None and isinstance(requests, numpy.ndarray):
+            size = len(self._list)
+            keys = numpy.fromiter(self._list, dtype=float, count=size)
+            values = numpy.fromiter(self.values(), dtype=float, count=size)
+            if not step:
+                return numpy.interp(requests, keys, values)
+            index = numpy.searchsorted(keys, requests, side='right') - 1
+            return values[numpy.maximum(index, 0)]
+
+        requests = list(requests)
+        result = [None] * len(requests)
+        interpolate = self._interpolate
+
+        for index, request, below, above in self._sweep(requests):
+            result[index] = interpolate(request, below, above, step)
+
+        return result
+
+    def cursor(self):
+        """Return cursor for sequential nearest-key lookups.
+
+        See :class:`NearestCursor`.
+        """
+        return NearestCursor(self)
 
     def __getitem__(self, request):
         """Return item corresponding to :meth:`.nearest_key`.
@@ -2,27 +2,93 @@
 
 """
 
-from itertools import count
+from array import array
+from itertools import chain, count, islice, repeat
 from operator import eq
 
-from sortedcontainers import SortedDict
 from sortedcontainers.sortedlist import recursive_repr
 
-from .recipes import abc
+from .recipes import (
+    _chunked,
+    _ItemMethodsMixin,
+    _NumberingMixin,
+    _PickleMixin,
+    abc,
+)
 
 NONE = object()
 
 
+class SliceView(abc.Sequence):
+    """Lazy sequence view of a slice of a mapping view.
+
+    Nothing is copied: iteration walks the mapping's positional index
+    directly and slicing a slice view returns another slice view. The view
+    keeps its slices rather than positions and applies them to the current
+    length of the mapping on every access, so it reflects later changes the
+    way slicing the mapping view again would.
+
+    """
+
+    # noqa pylint: disable=protected-access
+    def __init__(self, view, slices):
+        self._view = view
+        self._slices = slices
+
+    @property
+    def _positions(self):
+        "Range of mapping positions in the view."
+        positions = range(len(self._view._mapping))
+        for index in self._slices:
+            positions = positions[index]
+        return positions
+
+    def __len__(self):
+        "``len(slice_view)``"
+        return len(self._positions)
+
+    def __getitem__(self, index):
+        "``slice_view[index]``"
+        if isinstance(index, slice):
+            return SliceView(self._view, self._slices + (index,))
+        return self._view[self._positions[index]]
+
+    def __iter__(self):
+        "``iter(slice_view)``"
+        view = self._view
+        return view._from_keys(view._mapping._iter_keys(self._positions))
+
+    def __reversed__(self):
+        "``reversed(slice_view)``"
+        view = self._view
+        positions = self._positions[::-1]
+        return view._from_keys(view._mapping._iter_keys(positions))
+
+    def __eq__(self, other):
+        "Test slice view and other sequence for equality."
+        if not isinstance(other, abc.Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(map(eq, self, other))
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        "Text representation of slice view."
+        return f'{self.__class__.__name__}({list(self)!r})'
+
+
 class KeysView(abc.KeysView, abc.Sequence):
     "Read-only view of mapping keys."
     # noqa pylint: disable=too-few-public-methods,protected-access,too-many-ancestors
     def __getitem__(self, index):
         "``keys_view[index]``"
-        _nums = self._mapping._nums
         if isinstance(index, slice):
-            nums = _nums._list[index]
-            return [_nums[num] for num in nums]
-        return _nums[_nums._list[index]]
+            return SliceView(self, (index,))
+        return self._mapping._key_at(index)
+
+    @staticmethod
+    def _from_keys(keys):
+        return keys
 
 
 class ItemsView(abc.ItemsView, abc.Sequence):
@@ -30,15 +96,14 @@ class ItemsView(abc.ItemsView, abc.Sequence):
     # noqa pylint: disable=too-few-public-methods,protected-access,too-many-ancestors
     def __getitem__(self, index):
         "``items_view[index]``"
-        _mapping = self._mapping
-        _nums = _mapping._nums
         if isinstance(index, slice):
-            nums = _nums._list[index]
-            keys = [_nums[num] for num in nums]
-            return [(key, _mapping[key]) for key in keys]
-        num = _nums._list[index]
-        key = _nums[num]
-        return key, _mapping[key]
+            return SliceView(self, (index,))
+        key = self._mapping._key_at(index)
+        return key, self._mapping[key]
+
+    def _from_keys(self, keys):
+        _mapping = self._mapping
+        return ((key, _mapping[key]) for key in keys)
 
 
 class ValuesView(abc.ValuesView, abc.Sequence):
@@ -46,18 +111,58 @@ class ValuesView(abc.ValuesView, abc.Sequence):
     # noqa pylint: disable=too-few-public-methods,protected-access,too-many-ancestors
     def __getitem__(self, index):
         "``items_view[index]``"
-        _mapping = self._mapping
-        _nums = _mapping._nums
         if isinstance(index, slice):
-            nums = _nums._list[index]
-            keys = [_nums[num] for num in nums]
-            return [_mapping[key] for key in keys]
-        num = _nums._list[index]
-        key = _nums[num]
-        return _mapping[key]
+            return SliceView(self, (index,))
+        return self._mapping[self._mapping._key_at(index)]
+
+    def _from_keys(self, keys):
+        return map(self._mapping.__getitem__, keys)
+
+
+class _MappingMixin(_ItemMethodsMixin):
+    """Mixin for dicts with numerically indexable views.
+
+    Mutating methods are implemented with item assignment and deletion so
+    subclasses only override those to maintain their order index.
 
+    """
+
+    update = __update = abc.MutableMapping.update
+
+    def keys(self):
+        "Return set-like and sequence-like view of mapping keys."
+        return KeysView(self)
 
-class OrderedDict(dict):
+    def items(self):
+        "Return set-like and sequence-like view of mapping items."
+        return ItemsView(self)
+
+    def values(self):
+        "Return set-like and sequence-like view of mapping values."
+        return ValuesView(self)
+
+    @recursive_repr()
+    def __repr__(self):
+        "Text representation of mapping."
+        return f'{self.__class__.__name__}({list(self.items())!r})'
+
+    __str__ = __repr__
+
+    def copy(self):
+        "Return shallow copy of mapping."
+        return self.__class__(self)
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):
+        """Return new mapping with keys from iterable.
+
+        If not specified, value defaults to None.
+
+        """
+        return cls((key, value) for key in iterable)
+
+
+class OrderedDict(_NumberingMixin, _MappingMixin, _PickleMixin, dict):
     """Dictionary that remembers insertion order and is numerically indexable.
 
     Keys are numerically indexable using dict views. For example::
@@ -67,24 +172,29 @@ class OrderedDict(dict):
         >>> keys[0]
         'a'
         >>> keys[-2:]
-        ['d', 'e']
+        SliceView(['d', 'e'])
 
     The dict views support the sequence abstract base class.
 
+    Insertion order is tracked by numbering keys from a counter. The numbers
+    are renumbered densely by :meth:`OrderedDict.compact` when the counter
+    reaches `compact_threshold` or twice the size of the mapping, whichever is
+    greater, so they stay small integers.
+
     """
 
     # pylint: disable=super-init-not-called
     def __init__(self, *args, **kwargs):
-        self._keys = {}
-        self._nums = SortedDict()
-        self._keys_view = self._nums.keys()
-        self._count = count()
+        self._init_numbering()
         self.update(*args, **kwargs)
 
     def __setitem__(self, key, value, dict_setitem=dict.__setitem__):
         "``ordered_dict[key] = value``"
         if key not in self:
             num = next(self._count)
+            if num >= self._limit:
+                self.compact()
+                num = next(self._count)
             self._keys[key] = num
             self._nums[num] = key
         dict_setitem(self, key, value)
@@ -95,16 +205,6 @@ class OrderedDict(dict):
         num = self._keys.pop(key)
         del self._nums[num]
 
-    def __iter__(self):
-        "``iter(ordered_dict)``"
-        return iter(self._nums.values())
-
-    def __reversed__(self):
-        "``reversed(ordered_dict)``"
-        nums = self._nums
-        for key in reversed(nums):
-            yield nums[key]
-
     def clear(self, dict_clear=dict.clear):
         "Remove all items from mapping."
         dict_clear(self)
@@ -118,74 +218,114 @@ class OrderedDict(dict):
         False.
 
         """
-        index = -1 if last else 0
-        num = self._keys_view[index]
-        key = self._nums[num]
+        key = self._key_at(-1 if last else 0)
         value = self.pop(key)
         return key, value
 
-    update = __update = abc.MutableMapping.update
+    def move_to_end(self, key, last=True):
+        """Move an existing key to either end of the mapping.
 
-    def keys(self):
-        "Return set-like and sequence-like view of mapping keys."
-        return KeysView(self)
+        The key is moved to the end if last is True (the default) or to the
+        beginning if last is False. Raise KeyError if key is not found.
 
-    def items(self):
-        "Return set-like and sequence-like view of mapping items."
-        return ItemsView(self)
-
-    def values(self):
-        "Return set-like and sequence-like view of mapping values."
-        return ValuesView(self)
-
-    def pop(self, key, default=NONE):
-        """Remove given key and return corresponding value.
-
-        If key is not found, default is returned if given, otherwise raise
-        KeyError.
+        >>> ordered_dict = OrderedDict.fromkeys('abcde')
+        >>> ordered_dict.move_to_end('b')
+        >>> ''.join(ordered_dict)
+        'acdeb'
+        >>> ordered_dict.move_to_end('b', last=False)
+        >>> ''.join(ordered_dict)
+        'bacde'
 
         """
-        if key in self:
-            value = self[key]
-            del self[key]
-            return value
-        if default is NONE:
-            raise KeyError(key)
-        return default
+        _keys = self._keys
+        num = _keys[key]
+        _nums = self._nums
+        if self._keys_view[-1 if last else 0] == num:
+            return
+        del _nums[num]
+        num = self._num_at(len(_nums) if last else 0)
+        _keys[key] = num
+        _nums[num] = key
+
+    def move_to_index(self, key, index):
+        """Move an existing key to position index.
+
+        After the move, ``mapping.keys()[index]`` is key. Raise KeyError if key
+        is not found and IndexError if index is out of range.
 
-    def setdefault(self, key, default=None):
-        """Return ``mapping.get(key, default)``, also set ``mapping[key] = default`` if
-        key not in mapping.
+        >>> ordered_dict = OrderedDict.fromkeys('abcde')
+        >>> ordered_dict.move_to_index('e', 1)
+        >>> ''.join(ordered_dict)
+        'aebcd'
 
         """
-        if key in self:
-            return self[key]
-        self[key] = default
-        return default
-
-    @recursive_repr()
-    def __repr__(self):
-        "Text representation of mapping."
-        return f'{self.__class__.__name__}({list(self.items())!r})'
-
-    __str__ = __repr__
+        if key not in self:
+            raise KeyError(key)
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('index out of range')
+        _keys = self._keys
+        _nums = self._nums
+        del _nums[_keys.pop(key)]
+        num = self._num_at(index)
+        _keys[key] = num
+        _nums[num] = key
+
+    def compact(self):
+        "Renumber entries densely from zero in one pass preserving order."
+        # pylint: disable=protected-access
+        _nums = self._nums
+        self._load_keys(list(map(_nums.__getitem__, _nums._list)))
 
-    def __reduce__(self):
-        "Support for pickling serialization."
-        return (self.__class__, (list(self.items()),))
+    def _key_at(self, index):
+        "Return key at position index."
+        # pylint: disable=protected-access
+        _nums = self._nums
+        return _nums[_nums._list[index]]
 
-    def copy(self):
-        "Return shallow copy of mapping."
-        return self.__class__(self)
+    def _iter_keys(self, positions):
+        "Return iterator of keys at positions in range."
+        # pylint: disable=protected-access
+        _nums = self._nums
+        _list = _nums._list
+        if not positions:
+            return iter(())
+        if positions.step == 1:
+            nums = _list.islice(positions[0], positions[-1] + 1)
+        elif positions.step == -1:
+            nums = _list.islice(positions[-1], positions[0] + 1, reverse=True)
+        else:
+            nums = map(_list.__getitem__, positions)
+        return map(_nums.__getitem__, nums)
+
+    def __getstate__(self):
+        keys = list(self)
+        return keys, list(map(self.__getitem__, keys))
+
+    def __setstate__(self, state):
+        keys, values = state
+        if self.validate_pickle and len(keys) != len(values):
+            raise ValueError('pickled keys do not match values')
+        dict.update(self, zip(keys, values))
+        self._load_keys(keys)
+        if self.validate_pickle and len(self) != len(keys):
+            raise ValueError('pickled keys are not unique')
 
     @classmethod
-    def fromkeys(cls, iterable, value=None):
-        """Return new mapping with keys from iterable.
+    def from_sorted(cls, iterable, validate=False):
+        """Return new mapping from (key, value) pairs already in insertion order.
 
-        If not specified, value defaults to None.
+        Keys are numbered in one bulk pass rather than inserted one at a time.
+        Any order is an insertion order so there is nothing to `validate`.
 
         """
-        return cls((key, value) for key in iterable)
+        # pylint: disable=unused-argument
+        mapping = cls()
+        dict.update(mapping, iterable)
+        mapping._load_keys(list(dict.keys(mapping)))
+        return mapping
 
     def __eq__(self, other):
         "Test self and other mapping for equality."
@@ -205,3 +345,264 @@ class OrderedDict(dict):
             assert nums[value] == key
 
         nums._check()
+
+
+class CompactOrderedDict(OrderedDict):
+    """Ordered dictionary with a compact positional index.
+
+    Like :class:`OrderedDict`, keys are numerically indexable using dict
+    views. For example::
+
+        >>> compact_dict = CompactOrderedDict.fromkeys('abcde')
+        >>> del compact_dict['b']
+        >>> keys = compact_dict.keys()
+        >>> keys[1]
+        'c'
+        >>> keys[-2:]
+        SliceView(['d', 'e'])
+
+    Keys are kept in order in a list of blocks of about `block_size` keys and
+    each key maps to the block that holds it. Blocks are shared so no object
+    is allocated per key, which makes the order index less than half the size
+    of OrderedDict's SortedDict of order numbers. A Fenwick tree (binary
+    indexed tree) of block lengths stored in an integer array locates the key
+    at any position.
+
+    Positional indexing is O(log n). Setting, deleting and moving keys are
+    O(log n) plus O(`block_size`) to update a block.
+
+    """
+
+    block_size = 1000
+
+    # pylint: disable=super-init-not-called
+    def __init__(self, *args, **kwargs):
+        self._keys = {}
+        self._blocks = []
+        self._places = {}
+        self._tree = array('q')
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key, value, dict_setitem=dict.__setitem__):
+        "``compact_dict[key] = value``"
+        if key not in self:
+            self._insert(len(self._keys), key)
+        dict_setitem(self, key, value)
+
+    def __delitem__(self, key, dict_delitem=dict.__delitem__):
+        "``del compact_dict[key]``"
+        dict_delitem(self, key)
+        self._remove(key)
+
+    def __iter__(self):
+        "``iter(compact_dict)``"
+        return chain.from_iterable(self._blocks)
+
+    def __reversed__(self):
+        "``reversed(compact_dict)``"
+        return chain.from_iterable(map(reversed, reversed(self._blocks)))
+
+    def iter_chunks(self, size=None):
+        """Return iterator of lists of keys in order.
+
+        Lists follow the internal blocks unless `size` is given, in which case
+        all lists but the last have `size` keys.
+
+        """
+        if size is not None:
+            return _chunked(self, size)
+        return map(list, self._blocks)
+
+    def clear(self, dict_clear=dict.clear):
+        "Remove all items from mapping."
+        dict_clear(self)
+        self._clear_index()
+
+    def _clear_index(self):
+        "Remove all keys from the order index but not from the mapping."
+        self._keys.clear()
+        del self._blocks[:]
+        self._places.clear()
+        del self._tree[:]
+
+    def _add(self, place, delta):
+        "Add delta to length of block at place in tree."
+        _tree = self._tree
+        size = len(_tree)
+        node = place + 1
+        while node <= size:
+            _tree[node - 1] += delta
+            node += node & -node
+
+    def _build(self):
+        "Build block places and tree of block lengths."
+        _blocks = self._blocks
+        self._places = dict(zip(map(id, _blocks), count()))
+        _tree = array('q', map(len, _blocks))
+        size = len(_tree)
+        for node in range(1, size + 1):
+            parent = node + (node & -node)
+            if parent <= size:
+                _tree[parent - 1] += _tree[node - 1]
+        self._tree = _tree
+
+    def _locate(self, index):
+        "Return (place, offset) pair of block and key at position index."
+        _tree = self._tree
+        size = len(_tree)
+        place = 0
+        step = 1 << (size.bit_length() - 1)
+        while step:
+            node = place + step
+            if node <= size and _tree[node - 1] <= index:
+                place = node
+                index -= _tree[node - 1]
+            step >>= 1
+        return place, index
+
+    def _insert(self, index, key):
+        "Insert key at position index."
+        _blocks = self._blocks
+        if not _blocks:
+            block = [key]
+            _blocks.append(block)
+            self._keys[key] = block
+            self._build()
+            return
+        if index == len(self._keys):
+            place = len(_blocks) - 1
+            block = _blocks[place]
+            block.append(key)
+        else:
+            place, offset = self._locate(index)
+            block = _blocks[place]
+            block.insert(offset, key)
+        self._keys[key] = block
+        if len(block) > 2 * self.block_size:
+            self._split(place)
+        else:
+            self._add(place, 1)
+
+    def _split(self, place):
+        "Split oversized block at place in half."
+        block = self._blocks[place]
+        block_size = self.block_size
+        half = block[block_size:]
+        del block[block_size:]
+        self._keys.update(zip(half, repeat(half)))
+        self._blocks.insert(place + 1, half)
+        self._build()
+
+    def _remove(self, key):
+        "Remove key from its block."
+        _blocks = self._blocks
+        block = self._keys.pop(key)
+        block.remove(key)
+        place = self._places[id(block)]
+        if len(block) > self.block_size // 2:
+            self._add(place, -1)
+        elif len(_blocks) > 1:
+            if not place:
+                place += 1
+            prev = _blocks[place - 1]
+            block = _blocks.pop(place)
+            prev.extend(block)
+            self._keys.update(zip(block, repeat(prev)))
+            if len(prev) > 2 * self.block_size:
+                self._split(place - 1)
+            else:
+                self._build()
+        elif block:
+            self._add(place, -1)
+        else:
+            self._clear_index()
+
+    def _key_at(self, index):
+        "Return key at position index."
+        size = len(self._keys)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('index out of range')
+        place, offset = self._locate(index)
+        return self._blocks[place][offset]
+
+    def _iter_keys(self, positions):
+        "Return iterator of keys at positions in range."
+        if not positions:
+            return iter(())
+        _blocks = self._blocks
+        if positions.step == 1:
+            place, offset = self._locate(positions[0])
+            keys = chain.from_iterable(islice(_blocks, place, None))
+            return islice(keys, offset, offset + len(positions))
+        if positions.step == -1:
+            place, offset = self._locate(positions[0])
+            blocks = islice(reversed(_blocks), len(_blocks) - place - 1, None)
+            keys = chain.from_iterable(map(reversed, blocks))
+            skip = len(_blocks[place]) - offset - 1
+            return islice(keys, skip, skip + len(positions))
+        return map(self._key_at, positions)
+
+    def move_to_end(self, key, last=True):
+        """Move an existing key to either end of the mapping.
+
+        The key is moved to the end if last is True (the default) or to the
+        beginning if last is False. Raise KeyError if key is not found.
+
+        """
+        block = self._keys[key]
+        if block is self._blocks[-1 if last else 0]:
+            if block[-1 if last else 0] == key:
+                return
+        self._remove(key)
+        self._insert(len(self._keys) if last else 0, key)
+
+    def move_to_index(self, key, index):
+        """Move an existing key to position index.
+
+        After the move, ``mapping.keys()[index]`` is key. Raise KeyError if key
+        is not found and IndexError if index is out of range.
+
+        """
+        if key not in self:
+            raise KeyError(key)
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError('index out of range')
+        self._remove(key)
+        self._insert(index, key)
+
+    def compact(self):
+        "Repack keys into full blocks in one pass preserving order."
+        self._load_keys(list(self))
+
+    def _load_keys(self, keys):
+        "Replace order with list of unique keys packed into full blocks."
+        block_size = self.block_size
+        starts = range(0, len(keys), block_size)
+        bounds = [(start, start + block_size) for start in starts]
+        self._blocks = [keys[start:stop] for start, stop in bounds]
+        self._keys.clear()
+        for block in self._blocks:
+            self._keys.update(zip(block, repeat(block)))
+        self._build()
+
+    def _check(self):
+        "Check consistency of internal member variables."
+        blocks = self._blocks
+        assert len(self._keys) == len(self) == sum(map(len, blocks))
+        places = {id(block): pos for pos, block in enumerate(blocks)}
+        assert self._places == places
+        for block in blocks:
+            assert block
+            assert len(block) <= 2 * self.block_size
+            for key in block:
+                assert self._keys[key] is block
+        tree = self._tree
+        assert len(tree) == len(blocks)
+        for node in range(1, len(tree) + 1):
+            start = node - (node & -node)
+            assert tree[node - 1] == sum(map(len, blocks[start:node]))
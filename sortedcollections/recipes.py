@@ -2,15 +2,503 @@
 
 """
 
+# pylint: disable=too-many-lines
+
+import random
+from bisect import bisect_left
 from collections import abc
 from copy import deepcopy
-from itertools import count
-
-from sortedcontainers import SortedDict, SortedKeyList, SortedSet
+from functools import partial
+from itertools import chain, count, filterfalse, islice
+from operator import gt
+
+from sortedcontainers import SortedDict, SortedKeyList, SortedList, SortedSet
+from sortedcontainers.sorteddict import (
+    SortedItemsView,
+    SortedKeysView,
+    SortedValuesView,
+    _view_delitem,
+)
 from sortedcontainers.sortedlist import recursive_repr
 
+NONE = object()
+
+
+def _load_blocks(sorted_list, values, keys=None):
+    """Replace contents of `sorted_list` with `values` in their given order.
+
+    Values, and their sort `keys` for keyed lists, are sliced directly into
+    load-sized sublists without being compared or sorted again.
+
+    """
+    # pylint: disable=protected-access
+    sorted_list._clear()
+    _load = sorted_list._load
+    bounds = [(pos, pos + _load) for pos in range(0, len(values), _load)]
+    _lists = sorted_list._lists
+    _lists.extend(values[start:stop] for start, stop in bounds)
+    if keys is None:
+        sorted_list._maxes.extend(sublist[-1] for sublist in _lists)
+    else:
+        _keys = sorted_list._keys
+        _keys.extend(keys[start:stop] for start, stop in bounds)
+        sorted_list._maxes.extend(sublist[-1] for sublist in _keys)
+    sorted_list._len = len(values)
+
+
+def _chunked(iterable, size):
+    "Return iterator of lists of up to size items from iterable."
+    if size < 1:
+        raise ValueError('size must be at least 1')
+    iterator = iter(iterable)
+    return iter(lambda: list(islice(iterator, size)), [])
+
+
+def _merge_update(mapping, pairs, sort_keys=None):
+    """Merge `pairs` into value-sorted `mapping` in a single pass.
+
+    New items are given `sort_keys` in iteration order of `pairs`. When
+    `sort_keys` is None the mapping values themselves are the sort keys.
+    Existing items keep their stored sort keys so the key function is never
+    called for them.
+
+    """
+    # pylint: disable=protected-access
+    _list = mapping._list
+    keys = list(_list)
+    if sort_keys is None:
+        sort_key = mapping.__getitem__
+    else:
+        cache = mapping._sort_keys
+        if cache is None:
+            cache = dict(zip(keys, chain.from_iterable(_list._keys)))
+        cache.update(zip(pairs, sort_keys))
+        sort_key = cache.__getitem__
+    if mapping and not dict.keys(mapping).isdisjoint(pairs):
+        keys = list(filterfalse(pairs.__contains__, keys))
+    dict.update(mapping, pairs)
+    keys.extend(pairs)
+    # Existing keys form one sorted run so the sort merges in new keys.
+    keys.sort(key=sort_key)
+    _load_blocks(_list, keys, list(map(sort_key, keys)))
+
+
+def _is_sorted(values):
+    "Return True if list of values is in non-decreasing order."
+    return not any(map(gt, values, islice(values, 1, None)))
+
+
+def _dump_blocks(sorted_list, keys=True):
+    """Return (load, lists, keys) layout of `sorted_list` for pickling.
+
+    The sort keys of keyed lists are left out when `keys` is false.
+
+    """
+    # pylint: disable=protected-access
+    _keys = getattr(sorted_list, '_keys', None) if keys else None
+    return sorted_list._load, sorted_list._lists, _keys
+
+
+def _restore_blocks(sorted_list, layout):
+    """Replace contents of `sorted_list` with pickled `layout`.
+
+    Sublists, and their sort keys for keyed lists, are used as given without
+    being compared or sorted again. Raise ValueError if a sublist is empty.
+
+    """
+    # pylint: disable=protected-access
+    load, lists, keys = layout
+    if not all(chain(lists, keys or ())):
+        raise ValueError('pickled layout has an empty block')
+    sorted_list._clear()
+    sorted_list._load = load
+    sorted_list._lists.extend(lists)
+    if keys is not None:
+        sorted_list._keys.extend(keys)
+        lists = keys
+    sorted_list._maxes.extend(sublist[-1] for sublist in lists)
+    sorted_list._len = sum(map(len, lists))
+
+
+def _restore_hashed(sorted_list, layout):
+    """Replace contents of list sorted by hash with pickled `layout`.
+
+    Hashes of strings and other objects vary between processes so they are
+    recomputed, and the values are only sorted again when their order changed.
+
+    """
+    # pylint: disable=protected-access
+    load, lists, _ = layout
+    keys = [list(map(hash, values)) for values in lists]
+    hashes = list(chain.from_iterable(keys))
+    if not _is_sorted(hashes):
+        sorted_list._clear()
+        sorted_list._load = load
+        sorted_list.update(chain.from_iterable(lists))
+    else:
+        _restore_blocks(sorted_list, (load, lists, keys))
+
+
+def _check_blocks(sorted_list, keys_for=None):
+    """Raise ValueError unless sublists of `sorted_list` are sorted.
+
+    Keyed lists must also store the sort keys that `keys_for` returns for the
+    list of values, which default to those given by the key function.
+
+    """
+    # pylint: disable=protected-access
+    _lists = sorted_list._lists
+    values = list(chain.from_iterable(_lists))
+    if isinstance(sorted_list, SortedKeyList):
+        _keys = sorted_list._keys
+        if list(map(len, _lists)) != list(map(len, _keys)):
+            raise ValueError('pickled sort keys do not match values')
+        sort_keys = list(chain.from_iterable(_keys))
+        if keys_for is None:
+            expected = list(map(sorted_list._key, values))
+        else:
+            expected = keys_for(values)
+        if expected != sort_keys:
+            raise ValueError('pickled sort keys do not match values')
+        values = sort_keys
+    if not _is_sorted(values):
+        raise ValueError('pickled layout is not sorted')
+
+
+def _rechunk(values, load):
+    """Return `values` sliced into `load`-sized lists.
+
+    A short last list is joined to the one before it so every list is at
+    least half full.
+
+    """
+    chunks = list(_chunked(values, load))
+    if len(chunks) > 1 and len(chunks[-1]) < load >> 1:
+        chunks[-2].extend(chunks.pop())
+    return chunks
+
+
+def _delete_slice(sorted_list, start, stop):
+    """Delete values at positions `start` to `stop` from `sorted_list`.
+
+    Sublists inside the range are dropped at once. The remainders of the
+    boundary sublists are joined with their neighbors and sliced again into
+    load-sized sublists so every sublist stays at least half full.
+
+    """
+    # pylint: disable=protected-access
+    _lists = sorted_list._lists
+    parallel = [_lists]
+    if isinstance(sorted_list, SortedKeyList):
+        parallel.append(sorted_list._keys)
+    first, lo = sorted_list._pos(start)
+    last, hi = sorted_list._pos(stop - 1)
+    lower = max(first - 1, 0)
+    after = last + 1
+    upper = min(after + 1, len(_lists))
+    hi += 1
+    for sublists in parallel:
+        values = list(chain.from_iterable(sublists[lower:first]))
+        values.extend(sublists[first][:lo])
+        values.extend(sublists[last][hi:])
+        values.extend(chain.from_iterable(sublists[after:upper]))
+        chunks = _rechunk(values, sorted_list._load)
+        sublists[lower:upper] = chunks
+    sublists = islice(parallel[-1], lower, lower + len(chunks))
+    sorted_list._maxes[lower:upper] = [sublist[-1] for sublist in sublists]
+    sorted_list._len -= stop - start
+    del sorted_list._index[:]
+
+
+class _RangeDeleteMixin:
+    """Mixin for sorted dicts adding bulk deletion of items by range.
+
+    Bounds are located by `_bisect_bound_left` and `_bisect_bound_right`,
+    which bisect by key unless overridden.
+
+    """
+
+    _sort_keys = None
+
+    def _bisect_bound_left(self, bound):
+        return self._list.bisect_left(bound)
+
+    def _bisect_bound_right(self, bound):
+        return self._list.bisect_right(bound)
+
+    def _range_bounds(self, minimum, maximum, inclusive):
+        "Return (start, stop) pair of positions of items between bounds."
+        min_inclusive, max_inclusive = inclusive
+        if minimum is None:
+            start = 0
+        elif min_inclusive:
+            start = self._bisect_bound_left(minimum)
+        else:
+            start = self._bisect_bound_right(minimum)
+        if maximum is None:
+            stop = len(self)
+        elif max_inclusive:
+            stop = self._bisect_bound_right(maximum)
+        else:
+            stop = self._bisect_bound_left(maximum)
+        return start, stop
+
+    def delete_range(self, minimum=None, maximum=None, inclusive=(True, True)):
+        """Delete items between `minimum` and `maximum` and return their number.
+
+        Bounds default to None which is automatically inclusive. Whole
+        internal blocks in the range are dropped at once and the dict entries
+        are removed in bulk.
+
+        """
+        # pylint: disable=protected-access
+        start, stop = self._range_bounds(minimum, maximum, inclusive)
+        if start >= stop:
+            return 0
+        _list = self._list
+        keys = _list[start:stop]
+        if stop - start == len(_list):
+            _list.clear()
+        else:
+            _delete_slice(_list, start, stop)
+        dict_delitem = dict.__delitem__
+        for key in keys:
+            dict_delitem(self, key)
+        if self._sort_keys is not None:
+            _sort_keys = self._sort_keys
+            for key in keys:
+                del _sort_keys[key]
+        return stop - start
+
+    def truncate_before(self, bound):
+        "Delete items sorted before `bound` and return their number."
+        return self.delete_range(maximum=bound, inclusive=(True, False))
+
+    def truncate_after(self, bound):
+        "Delete items sorted after `bound` and return their number."
+        return self.delete_range(minimum=bound, inclusive=(False, True))
+
+
+class _PickleMixin:
+    """Mixin for collections pickled by their internal layout.
+
+    Pickles hold the internal blocks of a collection in order and unpickling
+    restores them without sorting again or calling key functions. Set
+    `validate_pickle` to True, on a class or a subclass, to check restored
+    collections and raise ValueError when they are inconsistent. The default
+    methods pickle sorted dicts.
+
+    """
+
+    validate_pickle = False
+    _sort_keys = None
+    _sort_keys_for = None
+
+    def _pickle_factory(self):
+        "Return callable that makes an empty collection for unpickling."
+        return self.__class__
+
+    def __reduce__(self):
+        return self._pickle_factory(), (), self.__getstate__()
+
+    def __getstate__(self):
+        return dict(self), _dump_blocks(self._list)
+
+    def __setstate__(self, state):
+        mapping, layout = state
+        dict.update(self, mapping)
+        self._restore_layout(layout)
+        if self.validate_pickle:
+            self._validate_pickle()
+
+    def _restore_layout(self, layout):
+        "Restore pickled layout of sorted list and sort key cache."
+        # pylint: disable=protected-access
+        _list = self._list
+        _restore_blocks(_list, layout)
+        if self._sort_keys is not None:
+            keys = chain.from_iterable(_list._lists)
+            sort_keys = chain.from_iterable(_list._keys)
+            self._sort_keys.update(zip(keys, sort_keys))
+
+    def _validate_pickle(self):
+        "Raise ValueError if restored mapping is inconsistent."
+        keys = set(self._list)
+        if len(keys) != len(self._list) or keys != dict.keys(self):
+            raise ValueError('pickled keys do not match pickled layout')
+        _check_blocks(self._list, self._sort_keys_for)
+
+
+class _FromSortedMixin:
+    "Mixin for sorted dicts adding construction from presorted items."
+
+    # pylint: disable=too-few-public-methods
+    _sort_keys_for = None
+
+    @classmethod
+    def from_sorted(cls, *args, validate=False, **kwargs):
+        """Return new mapping from (key, value) pairs already in sorted order.
+
+        The last positional argument is a mapping or iterable of pairs with
+        unique keys and other arguments are passed to the constructor. Pairs
+        are sliced directly into the internal blocks in O(n) time without
+        sorting. The key function, if any, is called once per pair. When
+        `validate` is true, check the order in one linear pass and raise
+        ValueError if it is not sorted.
+
+        """
+        # pylint: disable=protected-access
+        *args, iterable = args
+        mapping = cls(*args, **kwargs)
+        dict.update(mapping, iterable)
+        keys = list(dict.keys(mapping))
+        if mapping._sort_keys_for is None:
+            sort_keys = None
+        else:
+            sort_keys = mapping._sort_keys_for(keys)
+            if mapping._sort_keys is not None:
+                mapping._sort_keys.update(zip(keys, sort_keys))
+        order = keys if sort_keys is None else sort_keys
+        if validate and not _is_sorted(order):
+            raise ValueError('items are not in sorted order')
+        _load_blocks(mapping._list, keys, sort_keys)
+        return mapping
 
-class IndexableDict(SortedDict):
+
+class _NumberingMixin:
+    """Mixin for ordered collections that number entries by position.
+
+    Entries map to numbers in the dict `_keys` and numbers map back to
+    entries in the SortedDict `_nums`. New numbers come from a counter or are
+    midpoints of their neighbors, and all entries are renumbered densely by
+    `compact` when the counter reaches `compact_threshold` or twice the size
+    of the collection, whichever is greater.
+
+    """
+
+    compact_threshold = 2 ** 30
+
+    def _init_numbering(self):
+        "Initialize empty numbering."
+        self._keys = {}
+        self._nums = SortedDict()
+        self._keys_view = self._nums.keys()
+        self._count = count()
+        self._limit = self.compact_threshold
+
+    def __iter__(self):
+        "``iter(collection)``"
+        # pylint: disable=protected-access
+        _nums = self._nums
+        return map(_nums.__getitem__, _nums._list)
+
+    def __reversed__(self):
+        "``reversed(collection)``"
+        # pylint: disable=protected-access
+        _nums = self._nums
+        return map(_nums.__getitem__, reversed(_nums._list))
+
+    def iter_chunks(self, size=None):
+        """Return iterator of lists of entries in order.
+
+        Lists follow the internal blocks unless `size` is given, in which case
+        all lists but the last have `size` entries.
+
+        >>> ordered_set = OrderedSet('abcde')
+        >>> list(ordered_set.iter_chunks(2))
+        [['a', 'b'], ['c', 'd'], ['e']]
+
+        """
+        # pylint: disable=protected-access
+        if size is not None:
+            return _chunked(self, size)
+        getitem = self._nums.__getitem__
+        return (list(map(getitem, nums)) for nums in self._nums._list._lists)
+
+    def _num_at(self, index):
+        """Return unused number that sorts at position index.
+
+        Numbers between neighbors are midpoints. When no midpoint remains, all
+        entries are renumbered.
+
+        """
+        _keys_view = self._keys_view
+        if index == len(_keys_view):
+            num = next(self._count)
+            if num < self._limit:
+                return num
+            self.compact()
+            return next(self._count)
+        if index == 0:
+            num = _keys_view[0] - 1
+            if num > -self._limit:
+                return num
+            self.compact()
+            return -1
+        prev_num = _keys_view[index - 1]
+        next_num = _keys_view[index]
+        num = (prev_num + next_num) / 2
+        if prev_num < num < next_num:
+            return num
+        self.compact()
+        return index - 0.5
+
+    def _load_keys(self, keys):
+        "Replace order with list of unique keys numbered from zero."
+        # pylint: disable=protected-access
+        _nums = self._nums
+        self._keys.clear()
+        self._keys.update(zip(keys, count()))
+        nums = list(range(len(keys)))
+        dict.clear(_nums)
+        dict.update(_nums, zip(nums, keys))
+        _load_blocks(_nums._list, nums)
+        self._count = count(len(keys))
+        self._limit = max(self.compact_threshold, 2 * len(keys))
+
+
+class _SampleMixin:
+    """Mixin for indexable collections adding random selection.
+
+    Items are drawn from the sequence returned by `_population`.
+
+    """
+
+    def _population(self):
+        return self._list
+
+    def choice(self, rng=None):
+        """Return a random item.
+
+        Draws use `rng`, which defaults to the :mod:`random` module. Raise
+        IndexError if the collection is empty.
+
+        """
+        population = self._population()
+        if not population:
+            raise IndexError('Cannot choose from an empty sequence')
+        rng = random if rng is None else rng
+        return population[rng.randrange(len(population))]
+
+    def sample(self, k, rng=None):
+        """Return list of `k` unique items chosen at random.
+
+        Draws use `rng`, which defaults to the :mod:`random` module. Positions
+        are sampled first so large samples copy the items once rather than
+        indexing for each one. Raise ValueError if `k` is negative or larger
+        than the collection.
+
+        """
+        population = self._population()
+        rng = random if rng is None else rng
+        size = len(population)
+        positions = rng.sample(range(size), k)
+        if k > size // 8:
+            population = list(population)
+        return [population[pos] for pos in positions]
+
+
+class IndexableDict(_PickleMixin, _SampleMixin, SortedDict):
     """Dictionary that supports numerical indexing.
 
     Keys are numerically indexable using dict views. For example::
@@ -20,15 +508,22 @@ class IndexableDict(SortedDict):
         >>> sorted(keys[:]) == ['a', 'b', 'c', 'd', 'e']
         True
 
-    The dict views support the sequence abstract base class.
+    The dict views support the sequence abstract base class. Random keys are
+    drawn with `choice` and `sample`.
 
     """
 
     def __init__(self, *args, **kwargs):
         super().__init__(hash, *args, **kwargs)
 
+    def __getstate__(self):
+        return dict(self), _dump_blocks(self._list, keys=False)
+
+    def _restore_layout(self, layout):
+        _restore_hashed(self._list, layout)
 
-class IndexableSet(SortedSet):
+
+class IndexableSet(_PickleMixin, _SampleMixin, SortedSet):
     """Set that supports numerical indexing.
 
     Values are numerically indexable. For example::
@@ -37,7 +532,8 @@ class IndexableSet(SortedSet):
         >>> sorted(indexable_set[:]) == ['a', 'b', 'c', 'd', 'e']
         True
 
-    `IndexableSet` implements the sequence abstract base class.
+    `IndexableSet` implements the sequence abstract base class. Random values
+    are drawn with `choice` and `sample`.
 
     """
 
@@ -45,11 +541,125 @@ class IndexableSet(SortedSet):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, key=hash, **kwargs)
 
-    def __reduce__(self):
-        return self.__class__, (set(self),)
+    def __getstate__(self):
+        return _dump_blocks(self._list, keys=False)
+
+    def __setstate__(self, state):
+        _list = self._list
+        _restore_hashed(_list, state)
+        self._set.update(_list)
+        if self.validate_pickle and len(self._set) != len(_list):
+            raise ValueError('pickled values are not unique')
+
 
+class _ItemMethodsMixin:
+    "Mixin of mapping methods built on item lookup, assignment and deletion."
 
-class ItemSortedDict(SortedDict):
+    def pop(self, key, default=NONE):
+        """Remove given key and return corresponding value.
+
+        If key is not found, default is returned if given, otherwise raise
+        KeyError.
+
+        """
+        if key in self:
+            value = self[key]
+            del self[key]
+            return value
+        if default is NONE:
+            raise KeyError(key)
+        return default
+
+    def setdefault(self, key, default=None):
+        """Return ``mapping.get(key, default)``, also set ``mapping[key] =
+        default`` if key not in mapping.
+
+        """
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+
+def _sort_keys_view_delitem(self, index):
+    "``del view[index]`` -- also removes cached sort keys."
+    # pylint: disable=protected-access
+    _mapping = self._mapping
+    keys = _mapping._list[index]
+    _view_delitem(self, index)
+    if _mapping._sort_keys is not None:
+        for key in keys if isinstance(index, slice) else (keys,):
+            del _mapping._sort_keys[key]
+
+
+class _SortKeysView(SortedKeysView):
+    "Sorted keys view that removes cached sort keys on deletion."
+    __slots__ = ()
+    __delitem__ = _sort_keys_view_delitem
+
+
+class _SortItemsView(SortedItemsView):
+    "Sorted items view that removes cached sort keys on deletion."
+    __slots__ = ()
+    __delitem__ = _sort_keys_view_delitem
+
+
+class _SortValuesView(SortedValuesView):
+    "Sorted values view that removes cached sort keys on deletion."
+    __slots__ = ()
+    __delitem__ = _sort_keys_view_delitem
+
+
+class _SortKeysMixin(_ItemMethodsMixin):
+    """Mixin for sorted dicts that may cache sort keys in `_sort_keys`.
+
+    Every removal, including deletion through a view, also removes the cached
+    sort key.
+
+    """
+
+    def __delitem__(self, key):
+        "``del mapping[key]``"
+        if key not in self:
+            raise KeyError(key)
+        self._list_remove(key)
+        dict.__delitem__(self, key)
+        if self._sort_keys is not None:
+            del self._sort_keys[key]
+
+    def popitem(self, index=-1):
+        "Remove and return (key, value) item pair at index."
+        key, value = super().popitem(index)
+        if self._sort_keys is not None:
+            del self._sort_keys[key]
+        return key, value
+
+    def clear(self):
+        "Remove all items from mapping."
+        super().clear()
+        if self._sort_keys is not None:
+            self._sort_keys.clear()
+
+    def keys(self):
+        "Return new sorted keys view of the mapping's keys."
+        return _SortKeysView(self)
+
+    def items(self):
+        "Return new sorted items view of the mapping's items."
+        return _SortItemsView(self)
+
+    def values(self):
+        "Return new sorted values view of the mapping's values."
+        return _SortValuesView(self)
+
+
+class ItemSortedDict(
+    _SortKeysMixin,
+    _FromSortedMixin,
+    _PickleMixin,
+    _RangeDeleteMixin,
+    SortedDict,
+):
     """Sorted dictionary with key-function support for item pairs.
 
     Requires key function callable specified as the first argument. The
@@ -64,26 +674,40 @@ class ItemSortedDict(SortedDict):
     Above, the key/value item pairs are ordered by ``key * value`` according to
     the callable given as the first argument.
 
+    Optional `cache_keys` keyword argument stores the result of the key
+    function alongside each item so that it is called exactly once per
+    assignment. Removals then locate items by their stored sort key. (Default:
+    False)
+
+    Bounds given to :meth:`ItemSortedDict.delete_range` and the truncate
+    methods are compared with the results of the key function.
+
     """
 
     def __init__(self, *args, **kwargs):
         assert args and callable(args[0])
+        cache_keys = kwargs.pop('cache_keys', False)
         args = list(args)
         func = self._func = args[0]
 
-        def key_func(key):
-            "Apply key function to (key, value) item pair."
-            return func(key, self[key])
+        if cache_keys:
+            sort_keys = self._sort_keys = {}
+            key_func = sort_keys.__getitem__
+        else:
+            self._sort_keys = None
+
+            def key_func(key):
+                "Apply key function to (key, value) item pair."
+                return func(key, self[key])
 
         args[0] = key_func
         super().__init__(*args, **kwargs)
 
-    def __delitem__(self, key):
-        "``del mapping[key]``"
-        if key not in self:
-            raise KeyError(key)
-        self._list_remove(key)
-        dict.__delitem__(self, key)
+    def _bisect_bound_left(self, bound):
+        return self._list.bisect_key_left(bound)
+
+    def _bisect_bound_right(self, bound):
+        return self._list.bisect_key_right(bound)
 
     def __setitem__(self, key, value):
         "``mapping[key] = value``"
@@ -91,22 +715,61 @@ class ItemSortedDict(SortedDict):
             self._list_remove(key)
             dict.__delitem__(self, key)
         dict.__setitem__(self, key, value)
+        if self._sort_keys is not None:
+            self._sort_keys[key] = self._func(key, value)
         self._list_add(key)
 
     _setitem = __setitem__
 
+    def update(self, *args, **kwargs):
+        """Update mapping from a mapping or iterable and keyword arguments.
+
+        Large updates are sorted once and merged with the existing items.
+
+        """
+        if not kwargs and len(args) == 1 and isinstance(args[0], dict):
+            pairs = args[0]
+        else:
+            pairs = dict(*args, **kwargs)
+
+        if (10 * len(pairs)) <= len(self):
+            for key in pairs:
+                self._setitem(key, pairs[key])
+        else:
+            sort_keys = map(self._func, pairs, pairs.values())
+            _merge_update(self, pairs, sort_keys)
+
+    _update = update
+
     def copy(self):
         "Return shallow copy of the mapping."
-        return self.__class__(self._func, iter(self.items()))
+        cache_keys = self._sort_keys is not None
+        items = iter(self.items())
+        return self.__class__(self._func, items, cache_keys=cache_keys)
 
     __copy__ = copy
 
     def __deepcopy__(self, memo):
+        cache_keys = self._sort_keys is not None
         items = (deepcopy(item, memo) for item in self.items())
-        return self.__class__(self._func, items)
+        return self.__class__(self._func, items, cache_keys=cache_keys)
+
+    def _pickle_factory(self):
+        cache_keys = self._sort_keys is not None
+        return partial(self.__class__, self._func, cache_keys=cache_keys)
 
+    def _sort_keys_for(self, keys):
+        "Return list of sort keys of items with given keys."
+        return list(map(self._func, keys, map(self.__getitem__, keys)))
 
-class ValueSortedDict(SortedDict):
+
+class ValueSortedDict(
+    _SortKeysMixin,
+    _FromSortedMixin,
+    _PickleMixin,
+    _RangeDeleteMixin,
+    SortedDict,
+):
     """Sorted dictionary that maintains (key, value) item pairs sorted by value.
 
     - ``ValueSortedDict()`` -> new empty dictionary.
@@ -130,16 +793,36 @@ class ValueSortedDict(SortedDict):
     pair to determine the comparable for sort order as with Python's builtin
     ``sorted`` function.
 
+    Optional `cache_keys` keyword argument stores the result of the key
+    function alongside each item so that it is called exactly once per
+    assignment. Removals then locate items by their stored sort key. Without a
+    key function there is nothing to cache and the argument is ignored.
+    (Default: False)
+
+    Bounds given to :meth:`ValueSortedDict.delete_range` and the truncate
+    methods are values, as with :meth:`ValueSortedDict.irange_value`.
+
+    Pickles keep the sorted internal blocks along with their sort keys, so
+    unpickling neither sorts nor calls the key function. Set the class
+    attribute `validate_pickle` to True to check the restored order instead.
+
     """
 
     def __init__(self, *args, **kwargs):
+        cache_keys = kwargs.pop('cache_keys', False)
+        self._sort_keys = None
         args = list(args)
         if args and callable(args[0]):
             func = self._func = args[0]
 
-            def key_func(key):
-                "Apply key function to ``mapping[value]``."
-                return func(self[key])
+            if cache_keys:
+                sort_keys = self._sort_keys = {}
+                key_func = sort_keys.__getitem__
+            else:
+
+                def key_func(key):
+                    "Apply key function to ``mapping[value]``."
+                    return func(self[key])
 
             args[0] = key_func
         else:
@@ -155,33 +838,272 @@ class ValueSortedDict(SortedDict):
                 args.insert(0, key_func)
         super().__init__(*args, **kwargs)
 
-    def __delitem__(self, key):
-        "``del mapping[key]``"
-        if key not in self:
-            raise KeyError(key)
-        self._list_remove(key)
-        dict.__delitem__(self, key)
-
     def __setitem__(self, key, value):
         "``mapping[key] = value``"
         if key in self:
             self._list_remove(key)
             dict.__delitem__(self, key)
         dict.__setitem__(self, key, value)
+        if self._sort_keys is not None:
+            self._sort_keys[key] = self._func(value)
         self._list_add(key)
 
     _setitem = __setitem__
 
+    def update(self, *args, **kwargs):
+        """Update mapping from a mapping or iterable and keyword arguments.
+
+        Incoming items are sorted by value once and merged with the existing
+        items in a single pass rather than inserted one at a time. Updates
+        that are small relative to the size of the mapping are applied item by
+        item.
+
+        """
+        if not kwargs and len(args) == 1 and isinstance(args[0], dict):
+            pairs = args[0]
+        else:
+            pairs = dict(*args, **kwargs)
+
+        if (10 * len(pairs)) <= len(self):
+            for key in pairs:
+                self._setitem(key, pairs[key])
+        elif self._func is None:
+            _merge_update(self, pairs)
+        else:
+            sort_keys = map(self._func, pairs.values())
+            _merge_update(self, pairs, sort_keys)
+
+    _update = update
+
+    def _value_key(self, value):
+        "Return sort key for `value`."
+        return value if self._func is None else self._func(value)
+
+    def irange_value(
+        self, minimum=None, maximum=None, inclusive=(True, True), reverse=False
+    ):
+        """Create an iterator of keys with values between `minimum` and
+        `maximum`.
+
+        Both bounds default to None which is automatically inclusive. The
+        key function, if any, is applied to the bounds. Runs in O(log(n) + k)
+        time by bisecting the stored sort keys.
+
+        >>> mapping = ValueSortedDict(a=3, b=1, c=2, d=5)
+        >>> list(mapping.irange_value(2, 4))
+        ['c', 'a']
+        >>> list(mapping.irange_value(2, inclusive=(False, True)))
+        ['a', 'd']
+
+        :param minimum: minimum value to start iterating
+        :param maximum: maximum value to stop iterating
+        :param inclusive: pair of booleans
+        :param bool reverse: yield keys in reverse order
+        :return: iterator of keys
+
+        """
+        min_key = None if minimum is None else self._value_key(minimum)
+        max_key = None if maximum is None else self._value_key(maximum)
+        return self._list.irange_key(min_key, max_key, inclusive, reverse)
+
+    def bisect_value_left(self, value):
+        """Return index to insert an item with `value` before equal values.
+
+        >>> mapping = ValueSortedDict(a=3, b=1, c=2, d=5)
+        >>> mapping.bisect_value_left(2)
+        1
+
+        """
+        return self._list.bisect_key_left(self._value_key(value))
+
+    def bisect_value_right(self, value):
+        """Return index to insert an item with `value` after equal values.
+
+        >>> mapping = ValueSortedDict(a=3, b=1, c=2, d=5)
+        >>> mapping.bisect_value_right(2)
+        2
+
+        """
+        return self._list.bisect_key_right(self._value_key(value))
+
+    def count_values_between(
+        self, minimum=None, maximum=None, inclusive=(True, True)
+    ):
+        """Return number of items with values between `minimum` and `maximum`.
+
+        Bounds behave as in :meth:`ValueSortedDict.irange_value`. Runs in
+        O(log(n)) time.
+
+        >>> mapping = ValueSortedDict(a=3, b=1, c=2, d=5)
+        >>> mapping.count_values_between(2, 5, inclusive=(True, False))
+        2
+
+        """
+        start, stop = self._range_bounds(minimum, maximum, inclusive)
+        return max(stop - start, 0)
+
+    _bisect_bound_left = bisect_value_left
+    _bisect_bound_right = bisect_value_right
+
+    def _locate(self, key):
+        "Return (lists index, sublist index) pair of `key` in sort order."
+        # pylint: disable=protected-access
+        if key not in self:
+            raise KeyError(key)
+        _list = self._list
+        _lists = _list._lists
+        sort_key = _list._key(key)
+        pos = bisect_left(_list._maxes, sort_key)
+        idx = bisect_left(_list._keys[pos], sort_key)
+        while _lists[pos][idx] != key:
+            idx += 1
+            if idx == len(_lists[pos]):
+                pos += 1
+                idx = 0
+        return pos, idx
+
+    def rank(self, key):
+        """Return index of `key` in value order.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20)
+        >>> scores.rank('alice')
+        2
+
+        :raises KeyError: if `key` not found
+
+        """
+        # pylint: disable=protected-access
+        return self._list._loc(*self._locate(key))
+
+    def percentile(self, percent):
+        """Return key at the given `percent` (0 to 100) of value order.
+
+        The index is rounded down so percentile 0 is the key with the least
+        value and percentile 100 is the key with the greatest value.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20, dave=40)
+        >>> scores.percentile(50)
+        'carol'
+
+        :raises ValueError: if `percent` is not between 0 and 100
+        :raises IndexError: if mapping is empty
+
+        """
+        if not 0 <= percent <= 100:
+            raise ValueError(f'percentile {percent!r} not in range [0, 100]')
+        return self._list[int(percent * (len(self) - 1) / 100)]
+
+    def top(self, k):
+        """Return list of `k` items with greatest values, greatest first.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20)
+        >>> scores.top(2)
+        [('alice', 30), ('carol', 20)]
+
+        """
+        start = max(len(self) - k, 0)
+        keys = self._list.islice(start, reverse=True)
+        return [(key, self[key]) for key in keys]
+
+    def bottom(self, k):
+        """Return list of `k` items with least values, least first.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20)
+        >>> scores.bottom(2)
+        [('bob', 10), ('carol', 20)]
+
+        """
+        return [(key, self[key]) for key in self._list.islice(0, max(k, 0))]
+
+    def increment(self, key, delta=1):
+        """Add `delta` to value of `key` and return the new value.
+
+        Missing keys are set to `delta`. The item is located with a single
+        bisect and, when its new value still sorts between its neighbors,
+        updated in place without another bisect.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20)
+        >>> scores.increment('bob', 25)
+        35
+        >>> list(scores)
+        ['carol', 'alice', 'bob']
+
+        """
+        # pylint: disable=protected-access
+        if key not in self:
+            self[key] = delta
+            return delta
+        _list = self._list
+        _keys = _list._keys
+        pos, idx = self._locate(key)
+        value = self[key] + delta
+        sort_key = self._value_key(value)
+        keys_pos = _keys[pos]
+        if idx:
+            in_place = keys_pos[idx - 1] <= sort_key
+        else:
+            in_place = not pos or _list._maxes[pos - 1] <= sort_key
+        # Like assignment, an item that ties its successor moves after it.
+        if idx + 1 < len(keys_pos):
+            in_place = in_place and sort_key < keys_pos[idx + 1]
+        elif pos + 1 < len(_keys):
+            in_place = in_place and sort_key < _keys[pos + 1][0]
+        dict.__setitem__(self, key, value)
+        if self._sort_keys is not None:
+            self._sort_keys[key] = sort_key
+        if in_place:
+            keys_pos[idx] = sort_key
+            if idx + 1 == len(keys_pos):
+                _list._maxes[pos] = sort_key
+        else:
+            _list._delete(pos, idx)
+            self._list_add(key)
+        return value
+
+    def increment_many(self, pairs):
+        """Add deltas from mapping or iterable of (key, delta) `pairs`.
+
+        Deltas for repeated keys are combined. Many increments are applied by
+        repositioning all affected keys in one pass as with
+        :meth:`ValueSortedDict.update`.
+
+        >>> scores = ValueSortedDict(alice=30, bob=10, carol=20)
+        >>> scores.increment_many([('bob', 15), ('dave', 5), ('bob', 10)])
+        >>> list(scores.items())
+        [('dave', 5), ('carol', 20), ('alice', 30), ('bob', 35)]
+
+        """
+        if isinstance(pairs, abc.Mapping):
+            pairs = pairs.items()
+        deltas = {}
+        for key, delta in pairs:
+            deltas[key] = deltas[key] + delta if key in deltas else delta
+        if (10 * len(deltas)) <= len(self):
+            for key, delta in deltas.items():
+                self.increment(key, delta)
+        else:
+            values = {
+                key: self[key] + delta if key in self else delta
+                for key, delta in deltas.items()
+            }
+            self.update(values)
+
     def copy(self):
         "Return shallow copy of the mapping."
-        return self.__class__(self._func, iter(self.items()))
+        cache_keys = self._sort_keys is not None
+        items = iter(self.items())
+        return self.__class__(self._func, items, cache_keys=cache_keys)
 
     __copy__ = copy
 
-    def __reduce__(self):
-        items = [(key, self[key]) for key in self._list]
-        args = (self._func, items)
-        return (self.__class__, args)
+    def _pickle_factory(self):
+        cache_keys = self._sort_keys is not None
+        return partial(self.__class__, self._func, cache_keys=cache_keys)
+
+    def _sort_keys_for(self, keys):
+        "Return list of sort keys of items with given keys."
+        values = map(self.__getitem__, keys)
+        return list(values if self._func is None else map(self._func, values))
 
     @recursive_repr()
     def __repr__(self):
@@ -189,7 +1111,9 @@ class ValueSortedDict(SortedDict):
         return f'{self.__class__.__name__}({self._func!r}, {{{items}}})'
 
 
-class OrderedSet(abc.MutableSet, abc.Sequence):
+class OrderedSet(
+    _NumberingMixin, _PickleMixin, abc.MutableSet, abc.Sequence
+):
     """Like OrderedDict, OrderedSet maintains the insertion order of elements.
 
     For example::
@@ -203,15 +1127,17 @@ class OrderedSet(abc.MutableSet, abc.Sequence):
 
     OrderedSet also implements the collections.Sequence interface.
 
+    As with OrderedDict, insertion order is tracked by numbering elements from
+    a counter and :meth:`OrderedSet.compact` renumbers them densely when the
+    counter reaches `compact_threshold` or twice the size of the set,
+    whichever is greater.
+
     """
 
     # pylint: disable=too-many-ancestors
     def __init__(self, iterable=()):
         # pylint: disable=super-init-not-called
-        self._keys = {}
-        self._nums = SortedDict()
-        self._keys_view = self._nums.keys()
-        self._count = count()
+        self._init_numbering()
         self |= iterable
 
     def __contains__(self, key):
@@ -220,20 +1146,33 @@ class OrderedSet(abc.MutableSet, abc.Sequence):
 
     count = __contains__
 
-    def __iter__(self):
-        "``iter(ordered_set)``"
-        return iter(self._nums.values())
-
-    def __reversed__(self):
-        "``reversed(ordered_set)``"
-        _nums = self._nums
-        for key in reversed(_nums):
-            yield _nums[key]
-
     def __getitem__(self, index):
         "``ordered_set[index]`` -> element; lookup element at index."
-        num = self._keys_view[index]
-        return self._nums[num]
+        _nums = self._nums
+        if isinstance(index, slice):
+            return list(map(_nums.__getitem__, self._keys_view[index]))
+        return _nums[self._keys_view[index]]
+
+    def __delitem__(self, index):
+        """``del ordered_set[index]`` -- remove element at index.
+
+        Slices are removed in bulk.
+
+        >>> ordered_set = OrderedSet('abcde')
+        >>> del ordered_set[:2]
+        >>> ordered_set
+        OrderedSet(['c', 'd', 'e'])
+
+        """
+        if not isinstance(index, slice):
+            self.pop(index)
+            return
+        _keys = self._keys
+        _nums = self._nums
+        _keys_view = self._keys_view
+        for num in _keys_view[index]:
+            del _keys[_nums[num]]
+        del _keys_view[index]
 
     def __len__(self):
         "``len(ordered_set)``"
@@ -243,14 +1182,18 @@ class OrderedSet(abc.MutableSet, abc.Sequence):
         "Return index of value."
         # pylint: disable=arguments-differ
         try:
-            return self._keys[value]
+            num = self._keys[value]
         except KeyError:
             raise ValueError(f'{value!r} is not in {type(self).__name__}')
+        return self._nums.index(num)
 
     def add(self, value):
         "Add element, value, to set."
         if value not in self._keys:
             num = next(self._count)
+            if num >= self._limit:
+                self.compact()
+                num = next(self._count)
             self._keys[value] = num
             self._nums[num] = value
 
@@ -260,6 +1203,182 @@ class OrderedSet(abc.MutableSet, abc.Sequence):
         if num is not None:
             del self._nums[num]
 
+    def pop(self, index=-1):
+        """Remove and return element at index (default last).
+
+        Raise IndexError if set is empty or index is out of range.
+
+        """
+        # pylint: disable=arguments-differ
+        if not self._keys:
+            raise IndexError('pop from empty set')
+        value = self._nums.popitem(index)[1]
+        del self._keys[value]
+        return value
+
+    def insert(self, index, value):
+        """Insert element, value, before index.
+
+        As with :meth:`list.insert`, index is clamped to the bounds of the
+        set. If value is already a member, the set is unchanged.
+
+        >>> ordered_set = OrderedSet('abd')
+        >>> ordered_set.insert(2, 'c')
+        >>> ordered_set
+        OrderedSet(['a', 'b', 'c', 'd'])
+
+        """
+        if value in self._keys:
+            return
+        size = len(self._keys)
+        if index < 0:
+            index = max(index + size, 0)
+        num = self._num_at(min(index, size))
+        self._keys[value] = num
+        self._nums[num] = value
+
+    def clear(self):
+        "Remove all elements from set."
+        self._keys.clear()
+        self._nums.clear()
+
+    def compact(self):
+        "Renumber elements densely from zero in one pass preserving order."
+        self._load_keys(list(self))
+
+    @classmethod
+    def from_sorted(cls, iterable, validate=False):
+        """Return new set from values already in insertion order.
+
+        Values are numbered in one bulk pass rather than added one at a time.
+        Any order is an insertion order so there is nothing to `validate`.
+
+        """
+        # pylint: disable=protected-access,unused-argument
+        ordered_set = cls()
+        ordered_set._load_keys(list(dict.fromkeys(iterable)))
+        return ordered_set
+
+    def __getstate__(self):
+        return list(self)
+
+    def __setstate__(self, state):
+        self._load_keys(state)
+        if self.validate_pickle and len(self._keys) != len(state):
+            raise ValueError('pickled values are not unique')
+
+    def update(self, *iterables):
+        """Update set, adding elements from all iterables in order.
+
+        Many new elements are appended in one bulk pass.
+
+        """
+        values = dict.fromkeys(chain.from_iterable(iterables))
+        values = list(filterfalse(self._keys.__contains__, values))
+        if 10 * len(values) <= len(self):
+            for value in values:
+                self.add(value)
+        else:
+            self._load_keys(list(chain(self, values)))
+
+    def __ior__(self, other):
+        "``ordered_set |= other``"
+        self.update(other)
+        return self
+
+    def union(self, *iterables):
+        "Return new set with elements from set and all iterables."
+        return self._from_iterable(chain(self, *iterables))
+
+    def __or__(self, other):
+        "``ordered_set | other``"
+        return self.union(other)
+
+    def intersection_update(self, *iterables):
+        "Update set, keeping only elements found in set and all iterables."
+        values = list(self)
+        for iterable in iterables:
+            values = list(filter(set(iterable).__contains__, values))
+        if len(values) != len(self):
+            self._load_keys(values)
+
+    def __iand__(self, other):
+        "``ordered_set &= other``"
+        self.intersection_update(other)
+        return self
+
+    def intersection(self, *iterables):
+        "Return new set with elements common to set and all iterables."
+        values = self
+        for iterable in iterables:
+            values = list(filter(set(iterable).__contains__, values))
+        return self._from_iterable(values)
+
+    def __and__(self, other):
+        "``ordered_set & other``"
+        return self.intersection(other)
+
+    def difference_update(self, *iterables):
+        """Update set, removing elements found in iterables.
+
+        Removing many elements rebuilds the set in one bulk pass.
+
+        """
+        values = set(chain.from_iterable(iterables))
+        if 10 * len(values) <= len(self):
+            for value in values:
+                self.discard(value)
+        else:
+            self._load_keys(list(filterfalse(values.__contains__, self)))
+
+    def __isub__(self, other):
+        "``ordered_set -= other``"
+        self.difference_update(other)
+        return self
+
+    def difference(self, *iterables):
+        "Return new set with elements in set but not in iterables."
+        values = set(chain.from_iterable(iterables))
+        return self._from_iterable(filterfalse(values.__contains__, self))
+
+    def __sub__(self, other):
+        "``ordered_set - other``"
+        return self.difference(other)
+
+    def _symmetric_difference(self, other):
+        "Return list of elements in either set or other but not both."
+        values = list(filterfalse(other.__contains__, self))
+        values.extend(filterfalse(self._keys.__contains__, other))
+        return values
+
+    def symmetric_difference_update(self, other):
+        """Update set, keeping elements in either set or other but not both.
+
+        Many changes rebuild the set in one bulk pass.
+
+        """
+        other = dict.fromkeys(other)
+        if 10 * len(other) <= len(self):
+            for value in other:
+                if value in self._keys:
+                    self.discard(value)
+                else:
+                    self.add(value)
+        else:
+            self._load_keys(self._symmetric_difference(other))
+
+    def __ixor__(self, other):
+        "``ordered_set ^= other``"
+        self.symmetric_difference_update(other)
+        return self
+
+    def symmetric_difference(self, other):
+        "Return new set with elements in either set or other but not both."
+        other = dict.fromkeys(other)
+        return self._from_iterable(self._symmetric_difference(other))
+
+    __xor__ = symmetric_difference
+
     def __repr__(self):
         "Text representation of set."
         return f'{type(self).__name__}({list(self)!r})'
@@ -267,67 +1386,306 @@ class OrderedSet(abc.MutableSet, abc.Sequence):
     __str__ = __repr__
 
 
-class SegmentList(SortedKeyList):
+class SegmentList(_PickleMixin, SortedList):
     """List that supports fast random insertion and deletion of elements.
 
-    SegmentList is a special case of a SortedList initialized with a key
-    function that always returns 0. As such, several SortedList methods are not
-    implemented for SegmentList.
+    SegmentList reuses the blocks and positional index of SortedList but
+    keeps values in insertion order rather than sorted order. Random access,
+    insertion and deletion by index are O(log n). Searching by value is
+    linear. Methods of SortedList that depend on sort order are not
+    implemented.
+
+    >>> segment_list = SegmentList('abd')
+    >>> segment_list.insert(2, 'c')
+    >>> segment_list
+    SegmentList(['a', 'b', 'c', 'd'])
 
     """
 
     # pylint: disable=too-many-ancestors
-    def __init__(self, iterable=()):
-        super().__init__(iterable, self.zero)
-
-    @staticmethod
-    def zero(_):
-        "Return 0."
-        return 0
+    def __contains__(self, value):
+        "``value in segment_list``"
+        return any(value in values for values in self._lists)
 
     def __setitem__(self, index, value):
+        """``segment_list[index] = value``
+
+        Contiguous slices may be assigned values of any length. The boundary
+        blocks are trimmed, interior blocks dropped and new blocks spliced in
+        at once.
+
+        >>> segment_list = SegmentList('abcdef')
+        >>> segment_list[1:5] = 'xy'
+        >>> segment_list
+        SegmentList(['a', 'x', 'y', 'f'])
+
+        """
         if isinstance(index, slice):
-            raise NotImplementedError
+            start, stop, step = index.indices(self._len)
+            values = list(value)
+            if step == 1:
+                self._splice(start, max(start, stop), values)
+                return
+            indices = range(start, stop, step)
+            if len(values) != len(indices):
+                raise ValueError(
+                    f'attempt to assign sequence of size {len(values)}'
+                    f' to extended slice of size {len(indices)}'
+                )
+            for pos, item in zip(indices, values):
+                self[pos] = item
+            return
         pos, idx = self._pos(index)
-        self._lists[pos][idx] = value
+        _lists_pos = self._lists[pos]
+        _lists_pos[idx] = value
+        self._maxes[pos] = _lists_pos[-1]
+
+    def __delitem__(self, index):
+        """``del segment_list[index]``
+
+        Contiguous slices are deleted by trimming the boundary blocks and
+        dropping interior blocks at once.
+
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                if start < stop:
+                    self._splice(start, stop, [])
+                return
+        super().__delitem__(index)
+
+    def _splice(self, start, stop, values):
+        """Replace values between positions start and stop with list values.
+
+        The boundary blocks are joined with their neighbors and sliced again
+        into load-sized blocks, as in `_delete_slice`, so blocks stay at least
+        half full.
+
+        """
+        _lists = self._lists
+        _len = self._len
+        if not _lists:
+            self.extend(values)
+            return
+        if start == _len:
+            first, lo = len(_lists) - 1, len(_lists[-1])
+        else:
+            first, lo = self._pos(start)
+        if stop == _len:
+            last, hi = len(_lists) - 1, len(_lists[-1])
+        else:
+            last, hi = self._pos(stop)
+        self._len += len(values) - (stop - start)
+        lower = max(first - 1, 0)
+        after = last + 1
+        upper = min(after + 1, len(_lists))
+        values[:0] = _lists[first][:lo]
+        values[:0] = chain.from_iterable(_lists[lower:first])
+        values.extend(_lists[last][hi:])
+        values.extend(chain.from_iterable(_lists[after:upper]))
+        blocks = _rechunk(values, self._load)
+        _lists[lower:upper] = blocks
+        self._maxes[lower:upper] = [block[-1] for block in blocks]
+        del self._index[:]
 
     def append(self, value):
-        if self._len:
-            pos = len(self._lists) - 1
-            self._lists[pos].append(value)
-            self._keys[pos].append(0)
+        "Append value to end of list."
+        _lists = self._lists
+        if _lists:
+            pos = len(_lists) - 1
+            _lists[pos].append(value)
             self._expand(pos)
         else:
-            self._lists.append([value])
-            self._keys.append([0])
-            self._maxes.append(0)
+            _lists.append([value])
+            self._maxes.append(value)
         self._len += 1
 
     def extend(self, values):
-        for value in values:
-            self.append(value)
+        """Extend list by appending values from iterable.
+
+        Many values are loaded in whole blocks at once.
+
+        """
+        values = list(values)
+        _load = self._load
+        if len(values) <= _load:
+            for value in values:
+                self.append(value)
+            return
+        _lists = self._lists
+        _maxes = self._maxes
+        self._len += len(values)
+        if _lists:
+            last = _lists[-1]
+            fill = max(_load - len(last), 0)
+            last.extend(values[:fill])
+            _maxes[-1] = last[-1]
+            del values[:fill]
+        starts = range(0, len(values), _load)
+        bounds = [(start, start + _load) for start in starts]
+        blocks = [values[start:stop] for start, stop in bounds]
+        _lists.extend(blocks)
+        _maxes.extend(block[-1] for block in blocks)
+        del self._index[:]
+
+    _update = extend
 
     def insert(self, index, value):
+        "Insert value before index."
         if index == self._len:
             self.append(value)
             return
         pos, idx = self._pos(index)
         self._lists[pos].insert(idx, value)
-        self._keys[pos].insert(idx, 0)
         self._expand(pos)
         self._len += 1
 
+    def _set_blocks(self, blocks):
+        "Replace contents with list of non-empty blocks."
+        self._lists = blocks
+        self._maxes = [values[-1] for values in blocks]
+        self._len = sum(map(len, blocks))
+        del self._index[:]
+
+    def __getstate__(self):
+        return self._load, self._lists
+
+    def __setstate__(self, state):
+        load, blocks = state
+        if not all(blocks):
+            raise ValueError('pickled layout has an empty block')
+        self._load = load
+        self._set_blocks(blocks)
+
+    def split(self, index):
+        """Split list at index and return (left, right) pair of new lists.
+
+        The blocks of the list are moved into the new lists without copying
+        values, except for the block that contains index, and the list is left
+        empty. Index is clamped to the bounds of the list.
+
+        >>> segment_list = SegmentList('abcde')
+        >>> left, right = segment_list.split(2)
+        >>> left, right
+        (SegmentList(['a', 'b']), SegmentList(['c', 'd', 'e']))
+
+        """
+        # pylint: disable=protected-access
+        _lists = self._lists
+        index, _, _ = slice(index, None).indices(self._len)
+        if index == self._len:
+            left_blocks, right_blocks = _lists, []
+        else:
+            pos, idx = self._pos(index)
+            left_blocks = _lists[:pos]
+            right_blocks = _lists[pos:]
+            if idx:
+                block = right_blocks[0]
+                left_blocks.append(block[:idx])
+                del block[:idx]
+        left = self.__class__()
+        right = self.__class__()
+        left._load = right._load = self._load
+        left._set_blocks(left_blocks)
+        right._set_blocks(right_blocks)
+        self._lists = []
+        self._clear()
+        return left, right
+
+    def concat(self, other):
+        """Move all values of other segment list to the end of the list.
+
+        The blocks of other are appended without copying values and other is
+        left empty.
+
+        """
+        # pylint: disable=protected-access
+        if other is self:
+            self += other
+            return
+        if other._load != self._load:
+            self.extend(other)
+        else:
+            self._set_blocks(self._lists + other._lists)
+            other._lists = []
+        other._clear()
+
+    def __iadd__(self, other):
+        "``segment_list += other`` -- copies blocks of other segment lists."
+        if isinstance(other, SegmentList) and other._load == self._load:
+            self._set_blocks(self._lists + list(map(list, other._lists)))
+        else:
+            self.extend(other)
+        return self
+
+    def count(self, value):
+        "Return number of occurrences of value."
+        return sum(values.count(value) for values in self._lists)
+
+    def index(self, value, start=None, stop=None):
+        """Return first index of value between start and stop.
+
+        Raise ValueError if value is not present.
+
+        """
+        start, stop, _ = slice(start, stop).indices(self._len)
+        offset = 0
+        for values in self._lists:
+            end = offset + len(values)
+            if end > start:
+                if offset >= stop:
+                    break
+                lo = max(start - offset, 0)
+                hi = min(stop - offset, len(values))
+                try:
+                    return offset + values.index(value, lo, hi)
+                except ValueError:
+                    pass
+            offset = end
+        raise ValueError(f'{value!r} is not in list')
+
+    def remove(self, value):
+        """Remove first occurrence of value.
+
+        Raise ValueError if value is not present.
+
+        """
+        for pos, values in enumerate(self._lists):
+            if value in values:
+                self._delete(pos, values.index(value))
+                return
+        raise ValueError(f'{value!r} not in list')
+
+    def discard(self, value):
+        "Remove first occurrence of value if present."
+        try:
+            self.remove(value)
+        except ValueError:
+            pass
+
     def reverse(self):
-        values = list(self)
-        values.reverse()
-        self.clear()
-        self.extend(values)
+        "Reverse list in place by reversing the blocks."
+        _lists = self._lists
+        _lists.reverse()
+        for values in _lists:
+            values.reverse()
+        self._maxes[:] = [values[-1] for values in _lists]
+        del self._index[:]
 
     def sort(self, key=None, reverse=False):
-        "Stable sort in place."
-        values = sorted(self, key=key, reverse=reverse)
-        self.clear()
-        self.extend(values)
+        """Stable sort in place.
+
+        Sorted values are written back into the existing blocks so the
+        positional index stays valid.
+
+        """
+        _lists = self._lists
+        values = sorted(chain.from_iterable(_lists), key=key, reverse=reverse)
+        values = iter(values)
+        for pos, block in enumerate(_lists):
+            block[:] = islice(values, len(block))
+            self._maxes[pos] = block[-1]
 
     def _not_implemented(self, *args, **kwargs):
         "Not implemented."
@@ -337,9 +1695,18 @@ class SegmentList(SortedKeyList):
     bisect = _not_implemented
     bisect_left = _not_implemented
     bisect_right = _not_implemented
-    bisect_key = _not_implemented
-    bisect_key_left = _not_implemented
-    bisect_key_right = _not_implemented
     irange = _not_implemented
-    irange_key = _not_implemented
     update = _not_implemented
+
+    def _check(self):
+        "Check consistency of internal member variables."
+        assert self._load >= 4
+        assert len(self._maxes) == len(self._lists)
+        assert self._len == sum(map(len, self._lists))
+        for values in self._lists:
+            assert values
+            assert len(values) <= self._load << 1
+        if self._index:
+            assert self._index[0] == self._len
+            for pos, values in enumerate(self._lists):
+                assert self._index[self._offset + pos] == len(values)
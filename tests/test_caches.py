@@ -0,0 +1,120 @@
+"Test sortedcollections caches."
+
+import pytest
+
+from sortedcollections import LFUCache, LRUCache, TTLCache
+
+
+class Timer:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_maxsize_error():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_lru():
+    evicted = []
+    cache = LRUCache(maxsize=3, on_evict=lambda *item: evicted.append(item))
+    cache.set_many(zip('abc', range(3)))
+    assert cache['a'] == 0
+    cache['d'] = 3
+    assert evicted == [('b', 1)]
+    assert list(cache) == ['c', 'a', 'd']
+    cache['c'] = 20
+    assert list(cache.items()) == [('a', 0), ('d', 3), ('c', 20)]
+    assert list(cache.values()) == [0, 3, 20]
+    assert cache.peekitem() == ('c', 20)
+    assert cache.peekitem(0) == ('a', 0)
+    assert cache.get('z') is None
+    assert cache.get_many('abz') == {'a': 0}
+    assert (cache.hits, cache.misses, cache.evictions) == (2, 3, 1)
+    assert 'b' not in cache
+    assert len(cache) == 3
+    del cache['a']
+    assert cache.popitem() == ('d', 3)
+    assert repr(cache) == "LRUCache([('c', 20)], maxsize=3)"
+    cache.clear()
+    assert len(cache) == 0
+    with pytest.raises(KeyError):
+        cache.popitem()
+
+
+def test_lru_set_many():
+    cache = LRUCache(maxsize=10)
+    cache.set_many({key: key for key in range(100)})
+    assert list(cache) == list(range(90, 100))
+    assert cache.evictions == 90
+    assert cache.peekitem(-3) == (97, 97)
+
+
+def test_lfu():
+    evicted = []
+    cache = LFUCache(maxsize=3, on_evict=lambda *item: evicted.append(item))
+    cache.set_many(zip('abc', range(3)))
+    for _ in range(2):
+        assert cache['a'] == 0
+    assert cache['b'] == 1
+    cache['d'] = 3
+    assert evicted == [('c', 2)]
+    cache['e'] = 4
+    assert evicted == [('c', 2), ('d', 3)]
+    assert list(cache) == ['e', 'b', 'a']
+    assert cache.frequency('a') == 3
+    cache['e'] = 40
+    assert cache.frequency('e') == 2
+    assert list(cache) == ['b', 'e', 'a']
+    assert cache.peekitem() == ('a', 0)
+    assert cache.peekitem(0) == ('b', 1)
+    assert cache.get_many(['a', 'z']) == {'a': 0}
+    assert (cache.hits, cache.misses, cache.evictions) == (4, 1, 2)
+    del cache['a']
+    assert len(cache) == 2
+    assert cache.popitem() == ('b', 1)
+    cache.clear()
+    assert len(cache) == 0
+    assert not cache._counts
+
+
+def test_ttl():
+    timer = Timer()
+    evicted = []
+    cache = TTLCache(
+        maxsize=3,
+        ttl=10,
+        timer=timer,
+        on_evict=lambda *item: evicted.append(item),
+    )
+    cache['a'] = 0
+    timer.now = 2
+    cache.set_many({'b': 1, 'c': 2})
+    timer.now = 4
+    cache['d'] = 3
+    assert evicted == [('a', 0)]
+    assert list(cache) == ['b', 'c', 'd']
+    timer.now = 5
+    cache['b'] = 10
+    assert cache.peekitem() == ('b', 10)
+    assert cache.peekitem(0) == ('c', 2)
+    timer.now = 12
+    assert 'c' not in cache
+    assert evicted == [('a', 0), ('c', 2)]
+    assert cache['d'] == 3
+    assert cache.get('c') is None
+    assert len(cache) == 2
+    timer.now = 14
+    assert cache.expire() == 1
+    assert cache.expire() == 0
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 3)
+    assert cache.popitem() == ('b', 10)
+    cache['e'] = 4
+    del cache['e']
+    cache['f'] = 5
+    cache.clear()
+    assert len(cache) == 0
+    assert not cache._expires
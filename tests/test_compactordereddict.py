@@ -0,0 +1,215 @@
+"Test sortedcollections.CompactOrderedDict"
+
+import pickle
+import random
+
+import pytest
+
+from sortedcollections import CompactOrderedDict, OrderedDict
+
+pairs = dict(enumerate(range(10)))
+
+
+class SmallCompactOrderedDict(CompactOrderedDict):
+    block_size = 4
+
+
+def test_init():
+    cod = CompactOrderedDict()
+    assert len(cod) == 0
+    cod._check()
+    cod = CompactOrderedDict(pairs)
+    assert len(cod) == 10
+    cod._check()
+    cod = CompactOrderedDict(a=0, b=1, c=2)
+    assert list(cod) == ['a', 'b', 'c']
+    cod._check()
+
+
+def test_setitem_delitem():
+    cod = CompactOrderedDict(pairs)
+    cod[5] = 50
+    assert list(cod) == list(range(10))
+    del cod[3]
+    del cod[9]
+    cod[10] = 10
+    assert list(cod) == [0, 1, 2, 4, 5, 6, 7, 8, 10]
+    assert list(reversed(cod)) == [10, 8, 7, 6, 5, 4, 2, 1, 0]
+    cod._check()
+    for key in list(cod):
+        del cod[key]
+        cod._check()
+    assert len(cod) == 0
+
+
+def test_blocks():
+    cod = SmallCompactOrderedDict.fromkeys(range(20))
+    assert list(map(len, cod._blocks)) == [4, 4, 4, 8]
+    cod._check()
+    for key in range(4, 8):
+        del cod[key]
+        cod._check()
+    assert list(cod) == [0, 1, 2, 3] + list(range(8, 20))
+    for key in range(3):
+        del cod[key]
+        cod._check()
+    assert list(reversed(cod)) == list(range(19, 7, -1)) + [3]
+    del cod[3]
+    del cod[19]
+    cod._check()
+    cod.compact()
+    assert list(map(len, cod._blocks)) == [4, 4, 3]
+    assert cod.keys()[4] == 12
+    cod._check()
+
+
+def test_indexing():
+    cod = SmallCompactOrderedDict.fromkeys(range(20))
+    for key in range(0, 20, 3):
+        del cod[key]
+    cod._check()
+    expected = [key for key in range(20) if key % 3]
+    keys = cod.keys()
+    for index in range(-len(expected), len(expected)):
+        assert keys[index] == expected[index]
+    assert keys[3:9] == expected[3:9]
+    assert keys[::-2] == expected[::-2]
+    assert keys[5:2] == []
+    for start in range(len(expected)):
+        for stop in range(len(expected) + 1):
+            for step in (1, -1):
+                index = slice(start, stop, step)
+                assert keys[index] == expected[index]
+                assert list(reversed(keys[index])) == expected[index][::-1]
+    assert cod.items()[1] == (2, None)
+    assert cod.values()[-3:] == [None] * 3
+    with pytest.raises(IndexError):
+        keys[len(expected)]
+    with pytest.raises(IndexError):
+        keys[-len(expected) - 1]
+
+
+def test_iter_chunks():
+    cod = SmallCompactOrderedDict.fromkeys(range(10))
+    assert list(cod.iter_chunks()) == [[0, 1, 2, 3], [4, 5, 6, 7, 8, 9]]
+    assert list(cod.iter_chunks(3))[-1] == [9]
+
+
+def test_popitem():
+    cod = CompactOrderedDict(pairs)
+    assert cod.popitem() == (9, 9)
+    assert cod.popitem(last=False) == (0, 0)
+    assert len(cod) == 8
+    cod._check()
+
+
+def test_clear():
+    cod = CompactOrderedDict(pairs)
+    del cod[0]
+    cod.clear()
+    assert len(cod) == 0
+    assert not cod._blocks
+    cod._check()
+
+
+def test_move_to_end():
+    cod = CompactOrderedDict.fromkeys('abcde')
+    cod.move_to_end('b')
+    assert ''.join(cod) == 'acdeb'
+    cod.move_to_end('b')
+    assert ''.join(cod) == 'acdeb'
+    cod.move_to_end('b', last=False)
+    assert ''.join(cod) == 'bacde'
+    cod.move_to_end('b', last=False)
+    assert ''.join(cod) == 'bacde'
+    cod._check()
+    with pytest.raises(KeyError):
+        cod.move_to_end('z')
+
+
+def test_move_to_index():
+    cod = CompactOrderedDict.fromkeys('abcde')
+    del cod['c']
+    cod.move_to_index('e', 1)
+    assert ''.join(cod) == 'aebd'
+    cod.move_to_index('a', -1)
+    assert ''.join(cod) == 'ebda'
+    cod._check()
+    with pytest.raises(KeyError):
+        cod.move_to_index('z', 0)
+    with pytest.raises(IndexError):
+        cod.move_to_index('a', 4)
+
+
+def test_move_single_key():
+    cod = CompactOrderedDict(a=1)
+    cod.move_to_index('a', 0)
+    assert cod == {'a': 1}
+    assert list(cod) == ['a']
+    cod._check()
+    cod.move_to_end('a', last=False)
+    assert cod['a'] == 1
+    cod._check()
+
+
+def test_compact():
+    cod = CompactOrderedDict.fromkeys(range(10))
+    del cod[4]
+    cod.compact()
+    assert cod._blocks == [[0, 1, 2, 3, 5, 6, 7, 8, 9]]
+    cod._check()
+    cod.clear()
+    cod.compact()
+    assert cod._blocks == []
+    cod._check()
+
+
+def test_random():
+    random.seed(0)
+    cod = SmallCompactOrderedDict()
+    od = OrderedDict()
+    for step in range(2000):
+        key = random.randrange(100)
+        action = random.random()
+        if action < 0.5:
+            cod[key] = od[key] = step
+        elif action < 0.8:
+            cod.pop(key, None)
+            od.pop(key, None)
+        elif key in cod and action < 0.9:
+            cod.move_to_end(key, last=action < 0.85)
+            od.move_to_end(key, last=action < 0.85)
+        elif key in cod:
+            index = random.randrange(len(od))
+            cod.move_to_index(key, index)
+            od.move_to_index(key, index)
+        if od:
+            index = random.randrange(len(od))
+            assert cod.keys()[index] == od.keys()[index]
+            assert cod.items()[index:] == od.items()[index:]
+        if not step % 100:
+            cod._check()
+    assert cod == od
+    assert list(cod.items()) == list(od.items())
+
+
+def test_reduce_copy():
+    cod = CompactOrderedDict(pairs)
+    del cod[2]
+    assert cod == pickle.loads(pickle.dumps(cod))
+    assert cod == cod.copy()
+    assert repr(cod).startswith('CompactOrderedDict([(0, 0), (1, 1), (3, 3)')
+
+
+def test_reduce_layout():
+    cod = SmallCompactOrderedDict(pairs)
+    cod.move_to_index(5, 0)
+    copy = pickle.loads(pickle.dumps(cod))
+    assert list(copy.items()) == list(cod.items())
+    copy._check()
+
+
+def test_from_sorted():
+    cod = SmallCompactOrderedDict.from_sorted(reversed(pairs.items()))
+    assert list(cod) == list(reversed(range(10)))
+    cod._check()
@@ -0,0 +1,240 @@
+import pickle
+import random
+
+import pytest
+
+from sortedcollections import DenseIndexableDict, DenseIndexableSet
+
+
+def test_dict_init():
+    dense_dict = DenseIndexableDict(enumerate('abc'), d=3)
+    assert dense_dict == {0: 'a', 1: 'b', 2: 'c', 'd': 3}
+    assert list(dense_dict) == [0, 1, 2, 'd']
+    assert list(reversed(dense_dict)) == ['d', 2, 1, 0]
+    dense_dict._check()
+
+
+def test_dict_setitem_delitem():
+    dense_dict = DenseIndexableDict.fromkeys(range(5), 0)
+    dense_dict[2] = 'two'
+    assert list(dense_dict) == [0, 1, 2, 3, 4]
+    del dense_dict[1]
+    assert list(dense_dict) == [0, 4, 2, 3]
+    del dense_dict[3]
+    assert list(dense_dict) == [0, 4, 2]
+    assert dense_dict.index(2) == 2
+    dense_dict._check()
+    with pytest.raises(KeyError):
+        del dense_dict[1]
+    dense_dict._check()
+
+
+def test_dict_views():
+    dense_dict = DenseIndexableDict(zip('abcde', range(5)))
+    keys = dense_dict.keys()
+    items = dense_dict.items()
+    values = dense_dict.values()
+    assert keys[0] == 'a'
+    assert keys[-1] == 'e'
+    assert keys[1:4] == ['b', 'c', 'd']
+    assert list(reversed(keys)) == list('edcba')
+    assert items[2] == ('c', 2)
+    assert values[::2] == [0, 2, 4]
+    assert random.choice(keys) in dense_dict
+    del dense_dict['a']
+    assert keys[0] == 'e'
+
+
+def test_dict_popitem():
+    dense_dict = DenseIndexableDict(zip('abcde', range(5)))
+    assert dense_dict.popitem() == ('e', 4)
+    assert dense_dict.popitem(0) == ('a', 0)
+    assert list(dense_dict) == ['d', 'b', 'c']
+    with pytest.raises(IndexError):
+        dense_dict.popitem(10)
+    dense_dict.clear()
+    dense_dict._check()
+    with pytest.raises(KeyError):
+        dense_dict.popitem()
+
+
+def test_dict_pop_setdefault():
+    dense_dict = DenseIndexableDict(a=1)
+    assert dense_dict.setdefault('a', 0) == 1
+    assert dense_dict.setdefault('b', 2) == 2
+    assert dense_dict.pop('a') == 1
+    assert dense_dict.pop('a', None) is None
+    with pytest.raises(KeyError):
+        dense_dict.pop('a')
+    assert list(dense_dict) == ['b']
+    dense_dict._check()
+
+
+def test_dict_repr_pickle_copy():
+    dense_dict = DenseIndexableDict(zip('abc', range(3)))
+    expected = "DenseIndexableDict([('a', 0), ('b', 1), ('c', 2)])"
+    assert repr(dense_dict) == expected
+    dense_dict['self'] = dense_dict
+    assert repr(dense_dict).endswith("('self', ...)])")
+    del dense_dict['self']
+    other = pickle.loads(pickle.dumps(dense_dict))
+    assert other == dense_dict
+    assert list(other) == list(dense_dict)
+    other._check()
+    copy = dense_dict.copy()
+    assert type(copy) is DenseIndexableDict
+    assert list(copy) == list(dense_dict)
+
+
+def test_dict_random():
+    dense_dict = DenseIndexableDict()
+    reference = {}
+    for _ in range(1000):
+        key = random.randrange(100)
+        if key in dense_dict and random.random() < 0.5:
+            del dense_dict[key]
+            del reference[key]
+        else:
+            dense_dict[key] = reference[key] = random.random()
+    assert dense_dict == reference
+    dense_dict._check()
+
+
+def test_set_init():
+    dense_set = DenseIndexableSet('abcab')
+    assert list(dense_set) == ['a', 'b', 'c']
+    assert list(reversed(dense_set)) == ['c', 'b', 'a']
+    assert len(dense_set) == 3
+    assert 'a' in dense_set
+    assert 'd' not in dense_set
+    dense_set._check()
+
+
+def test_set_getitem_index():
+    dense_set = DenseIndexableSet(range(10))
+    assert dense_set[3] == 3
+    assert dense_set[-1] == 9
+    assert dense_set[2:5] == [2, 3, 4]
+    assert dense_set.index(4) == 4
+    assert dense_set.count(4) == 1
+    assert dense_set.count(10) == 0
+    with pytest.raises(ValueError):
+        dense_set.index(10)
+    assert random.choice(dense_set) in dense_set
+
+
+def test_set_discard_pop():
+    dense_set = DenseIndexableSet(range(5))
+    dense_set.discard(1)
+    assert list(dense_set) == [0, 4, 2, 3]
+    dense_set.discard(10)
+    dense_set.remove(3)
+    assert list(dense_set) == [0, 4, 2]
+    assert dense_set.pop() == 2
+    assert dense_set.pop(0) == 0
+    assert list(dense_set) == [4]
+    with pytest.raises(IndexError):
+        dense_set.pop(5)
+    dense_set.clear()
+    dense_set._check()
+    with pytest.raises(IndexError):
+        dense_set.pop()
+
+
+def test_set_operations():
+    dense_set = DenseIndexableSet(range(5))
+    assert dense_set | {5} == set(range(6))
+    assert dense_set & {1, 2, 9} == {1, 2}
+    dense_set -= {0, 1}
+    assert dense_set == {2, 3, 4}
+    dense_set._check()
+
+
+def test_set_repr_pickle():
+    dense_set = DenseIndexableSet('abc')
+    assert repr(dense_set) == "DenseIndexableSet(['a', 'b', 'c'])"
+    other = pickle.loads(pickle.dumps(dense_set))
+    assert list(other) == list(dense_set)
+    other._check()
+
+
+def test_dict_choice_sample():
+    dense_dict = DenseIndexableDict.fromkeys(range(20), 1)
+    assert dense_dict.choice() in dense_dict
+    assert sorted(dense_dict.sample(20)) == list(range(20))
+    dense_set = DenseIndexableSet(range(20))
+    assert dense_set.choice(random.Random(0)) in dense_set
+    assert len(set(dense_set.sample(2))) == 2
+
+
+def test_dict_weighted_choice():
+    dense_dict = DenseIndexableDict(a=0, b=3, c=1)
+    rng = random.Random(0)
+    counts = {key: 0 for key in dense_dict}
+    for _ in range(4000):
+        counts[dense_dict.weighted_choice(rng)] += 1
+    assert counts['a'] == 0
+    assert 2700 < counts['b'] < 3300
+    dense_dict._check()
+    dense_dict['a'] = 2
+    dense_dict['d'] = 5
+    del dense_dict['b']
+    dense_dict._check()
+    assert dense_dict.weighted_choice() in dense_dict
+    with pytest.raises(ValueError):
+        dense_dict['e'] = -1
+    with pytest.raises(ValueError):
+        dense_dict['a'] = -1
+    assert dense_dict == {'a': 2, 'c': 1, 'd': 5}
+    dense_dict.clear()
+    assert dense_dict._tree is None
+    with pytest.raises(IndexError):
+        dense_dict.weighted_choice()
+    dense_dict['a'] = 0
+    with pytest.raises(ValueError):
+        dense_dict.weighted_choice()
+    with pytest.raises(ValueError):
+        DenseIndexableDict(a=-1).weighted_choice()
+
+
+def test_dict_weighted_random():
+    dense_dict = DenseIndexableDict()
+    dense_dict.weighted_sample(0)
+    rng = random.Random(0)
+    for _ in range(1000):
+        key = rng.randrange(50)
+        if key in dense_dict and rng.random() < 0.4:
+            del dense_dict[key]
+        else:
+            dense_dict[key] = rng.randrange(10)
+    dense_dict._check()
+    assert dense_dict.weighted_choice(rng) in dense_dict
+
+
+def test_dict_weighted_sample():
+    dense_dict = DenseIndexableDict((key, key % 3) for key in range(100))
+    positive = {key for key in dense_dict if key % 3}
+    for k in (0, 5, 60):
+        sample = dense_dict.weighted_sample(k, random.Random(k))
+        assert len(set(sample)) == k
+        assert set(sample) <= positive
+        dense_dict._check()
+    with pytest.raises(ValueError):
+        dense_dict.weighted_sample(67)
+    with pytest.raises(ValueError):
+        dense_dict.weighted_sample(-1)
+    dense_dict = DenseIndexableDict((key, 0) for key in range(100))
+    dense_dict[0] = 1
+    with pytest.raises(ValueError):
+        dense_dict.weighted_sample(2)
+    dense_dict._check()
+    with pytest.raises(ValueError):
+        DenseIndexableDict((key, 0) for key in range(100)).weighted_sample(1)
+
+
+def test_dict_weighted_sample_bias():
+    dense_dict = DenseIndexableDict.fromkeys(range(100), 1)
+    dense_dict[0] = 1000
+    rng = random.Random(0)
+    assert all(0 in dense_dict.weighted_sample(3, rng) for _ in range(20))
+    assert all(0 in dense_dict.weighted_sample(50, rng) for _ in range(20))
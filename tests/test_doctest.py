@@ -1,6 +1,8 @@
 import doctest
 
 import sortedcollections
+import sortedcollections.caches
+import sortedcollections.dense
 import sortedcollections.ordereddict
 import sortedcollections.recipes
 
@@ -11,6 +13,18 @@ def test_sortedcollections():
     assert failed == 0
 
 
+def test_sortedcollections_caches():
+    failed, attempted = doctest.testmod(sortedcollections.caches)
+    assert attempted > 0
+    assert failed == 0
+
+
+def test_sortedcollections_dense():
+    failed, attempted = doctest.testmod(sortedcollections.dense)
+    assert attempted > 0
+    assert failed == 0
+
+
 def test_sortedcollections_ordereddict():
     failed, attempted = doctest.testmod(sortedcollections.ordereddict)
     assert attempted > 0
@@ -1,6 +1,7 @@
 "Test sortedcollections.ItemSortedDict"
 
 import copy
+import pickle
 
 import pytest
 
@@ -88,3 +89,98 @@ def test_update():
     for index, letter in enumerate(alphabet):
         pair = {index: letter}
         temp.update(pair)
+
+
+def test_update_bulk():
+    temp = ItemSortedDict(value_func, enumerate(alphabet))
+    temp.update({0: 'zz', 30: 'b'})
+    assert temp.keys()[-1] == 0
+    assert temp.keys()[0] == 1
+    assert temp.keys()[1] == 30
+    temp._check()
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, key, value):
+        self.calls += 1
+        return value
+
+
+def test_cache_keys():
+    func = Counter()
+    temp = ItemSortedDict(func, enumerate(range(10)), cache_keys=True)
+    assert func.calls == 10
+    temp[0] = 100
+    assert func.calls == 11
+    assert list(temp)[-1] == 0
+    del temp[0]
+    assert temp.pop(1) == 1
+    assert temp.pop(1, 'missing') == 'missing'
+    with pytest.raises(KeyError):
+        temp.pop(1)
+    assert temp.popitem() == (9, 9)
+    assert temp.setdefault(3) == 3
+    assert temp.setdefault(20, -1) == -1
+    assert temp.keys()[0] == 20
+    temp.update({index: index for index in range(100)})
+    assert temp._sort_keys == dict(temp.items())
+    temp._check()
+    temp.clear()
+    assert not temp._sort_keys
+
+
+def test_cache_keys_copy():
+    temp = ItemSortedDict(value_func, enumerate(alphabet), cache_keys=True)
+    that = temp.copy()
+    assert that == temp
+    assert that._sort_keys == temp._sort_keys
+    that = copy.deepcopy(temp)
+    assert that == temp
+    assert that._sort_keys == temp._sort_keys
+
+
+def test_uncached():
+    temp = ItemSortedDict(value_func, enumerate(alphabet))
+    assert temp.popitem() == (25, 'z')
+    temp.clear()
+    assert len(temp) == 0
+
+
+def test_delete_range():
+    temp = ItemSortedDict(value_func, enumerate(alphabet), cache_keys=True)
+    temp._list._reset(4)
+    assert temp.truncate_before('d') == 3
+    assert temp.delete_range('h', 'k', inclusive=(True, False)) == 3
+    assert temp.truncate_after('w') == 3
+    assert ''.join(temp.values()) == 'defgklmnopqrstuvw'
+    assert set(temp._sort_keys) == set(temp)
+    temp._check()
+
+
+class CheckedDict(ItemSortedDict):
+    validate_pickle = True
+
+
+def test_pickle():
+    for cache_keys in (False, True):
+        temp = CheckedDict(value_func, zip(alphabet, range(26)))
+        temp = CheckedDict(value_func, temp, cache_keys=cache_keys)
+        that = pickle.loads(pickle.dumps(temp))
+        assert list(that.items()) == list(temp.items())
+        assert that._sort_keys == temp._sort_keys
+        that._check()
+    state = ({'a': 1, 'b': 0}, (1000, [['a', 'b']], [[1, 0]]))
+    with pytest.raises(ValueError):
+        CheckedDict(value_func).__setstate__(state)
+
+
+def test_from_sorted():
+    pairs = list(zip(alphabet, range(26)))
+    temp = ItemSortedDict.from_sorted(value_func, pairs, cache_keys=True)
+    assert list(temp.items()) == pairs
+    temp._check()
+    with pytest.raises(ValueError):
+        ItemSortedDict.from_sorted(value_func, pairs[::-1], validate=True)
@@ -1,3 +1,6 @@
+import pickle
+import random
+
 import pytest
 
 from sortedcollections import NearestDict
@@ -70,3 +73,258 @@ def test_nearest_next():
     assert d[3] == 'b'
     with pytest.raises(KeyError):
         d[4]
+
+
+ROUNDINGS = (
+    NearestDict.NEAREST_PREV,
+    NearestDict.NEAREST,
+    NearestDict.NEAREST_NEXT,
+)
+
+
+def _expected(d, requests, default):
+    result = []
+    for request in requests:
+        try:
+            result.append(d.nearest_key(request))
+        except KeyError:
+            result.append(default)
+    return result
+
+
+def test_nearest_keys():
+    random.seed(0)
+    for rounding in ROUNDINGS:
+        d = NearestDict(rounding=rounding)
+        d._list._reset(4)
+        d.update((random.randrange(100), None) for _ in range(50))
+        requests = [random.uniform(-10, 110) for _ in range(200)]
+        requests.extend(d.keys()[:10])
+        expected = _expected(d, requests, None)
+        assert d.nearest_keys(requests, default=None) == expected
+        requests = [v for v, key in zip(requests, expected) if key is not None]
+        assert d.nearest_keys(iter(requests)) == _expected(d, requests, None)
+
+
+def test_nearest_keys_errors():
+    d = NearestDict()
+    assert d.nearest_keys([]) == []
+    assert d.nearest_keys([1, 2], default=0) == [0, 0]
+    with pytest.raises(KeyError):
+        d.nearest_keys([1])
+    d = NearestDict({1: 'a'}, rounding=NearestDict.NEAREST_NEXT)
+    with pytest.raises(KeyError):
+        d.nearest_keys([0, 2])
+
+
+def test_get_many():
+    d = NearestDict({0: 'a', 10: 'b'}, rounding=NearestDict.NEAREST_PREV)
+    assert d.get_many([4, 6, 10]) == ['a', 'a', 'b']
+    assert d.get_many([-1, 11], default='z') == ['z', 'b']
+    with pytest.raises(KeyError):
+        d.get_many([-1])
+    d = NearestDict({0: 'zero', 5: 'five'}, rounding=NearestDict.NEAREST_NEXT)
+    assert d.get_many([0, 1, 9], default=0) == ['zero', 'five', 0]
+
+
+def test_nearest_keys_numpy():
+    numpy = pytest.importorskip('numpy')
+    random.seed(0)
+    for rounding in ROUNDINGS:
+        d = NearestDict(rounding=rounding)
+        d.update((float(random.randrange(100)), None) for _ in range(50))
+        requests = [random.uniform(-10, 110) for _ in range(200)]
+        requests.extend(d.keys()[:10])
+        expected = _expected(d, requests, -1.0)
+        result = d.nearest_keys(numpy.array(requests), default=-1.0)
+        assert isinstance(result, numpy.ndarray)
+        assert result.tolist() == expected
+        found = [value for value, key in zip(requests, expected) if key != -1]
+        result = d.nearest_keys(numpy.array(found))
+        assert result.tolist() == _expected(d, found, None)
+        assert d.get_many(numpy.array(found[:3])) == [None] * 3
+    with pytest.raises(KeyError, match='above'):
+        d.nearest_keys(numpy.array([200.0]))
+    d.rounding = NearestDict.NEAREST_PREV
+    with pytest.raises(KeyError, match='below'):
+        d.nearest_keys(numpy.array([-1.0]))
+    d = NearestDict()
+    with pytest.raises(KeyError, match='empty'):
+        d.nearest_keys(numpy.array([1.0]))
+    result = d.nearest_keys(numpy.array([1.0]), default=0.0)
+    assert result.tolist() == [0.0]
+
+
+def test_k_nearest():
+    random.seed(0)
+    keys = random.sample(range(1000), 100)
+    for rounding in ROUNDINGS:
+        d = NearestDict.fromkeys(keys)
+        d.rounding = rounding
+        d._list._reset(4)
+        for request in range(-10, 1010, 7):
+            if rounding == NearestDict.NEAREST_PREV:
+                candidates = [key for key in keys if key <= request]
+            elif rounding == NearestDict.NEAREST_NEXT:
+                candidates = [key for key in keys if key >= request]
+            else:
+                candidates = keys
+            candidates = sorted(
+                candidates, key=lambda key: (abs(key - request), -key)
+            )
+            for k in (0, 1, 5, 200):
+                assert d.k_nearest(request, k) == candidates[:k]
+
+
+def test_k_nearest_empty():
+    assert NearestDict().k_nearest(0, 3) == []
+    assert NearestDict({1: 'a'}).k_nearest(0, -1) == []
+
+
+def test_within():
+    keys = [1, 2, 4, 8, 16]
+    d = NearestDict.fromkeys(keys)
+    assert d.within(5, 3) == [2, 4, 8]
+    assert d.within(5, 0.5) == []
+    assert d.within(4, 0) == [4]
+    d.rounding = NearestDict.NEAREST_PREV
+    assert d.within(5, 3) == [2, 4]
+    d.rounding = NearestDict.NEAREST_NEXT
+    assert d.within(5, 3) == [8]
+
+
+def test_cursor():
+    random.seed(0)
+    for rounding in ROUNDINGS:
+        d = NearestDict(rounding=rounding)
+        d._list._reset(4)
+        d.update((random.randrange(1000), key) for key in range(100))
+        cursor = d.cursor()
+        requests = sorted(random.uniform(-10, 1010) for _ in range(300))
+        requests += [500, 250, 250.5, 2000]
+        for request in requests:
+            try:
+                expected = d[request]
+            except KeyError:
+                with pytest.raises(KeyError):
+                    cursor[request]
+            else:
+                assert cursor[request] == expected
+
+
+def test_cursor_mutation():
+    random.seed(0)
+    d = NearestDict()
+    d._list._reset(4)
+    cursor = d.cursor()
+    with pytest.raises(KeyError):
+        cursor.nearest_key(0)
+    d.update((key, key) for key in range(0, 200, 2))
+    request = 0
+    for _ in range(300):
+        request += random.random() * 2
+        assert cursor.nearest_key(request) == d.nearest_key(request)
+        key = random.randrange(400)
+        if key in d and len(d) > 1:
+            del d[key]
+        else:
+            d[key] = key
+    d.clear()
+    d[5] = 'a'
+    assert cursor[100] == 'a'
+    assert cursor[0] == 'a'
+
+
+def test_interpolate():
+    d = NearestDict({0: 0.0, 10: 100.0, 20: 50.0})
+    assert d.interpolate(5) == 50.0
+    assert d.interpolate(15) == 75.0
+    assert d.interpolate(10) == 100.0
+    assert d.interpolate(-5) == 0.0
+    assert d.interpolate(25) == 50.0
+    assert d.interpolate(15, step=True) == 100.0
+    assert d.interpolate(-5, step=True) == 0.0
+    with pytest.raises(KeyError):
+        NearestDict().interpolate(0)
+
+
+def test_interpolate_many():
+    random.seed(0)
+    d = NearestDict((float(key), random.random()) for key in range(100))
+    d._list._reset(4)
+    requests = [random.uniform(-10, 110) for _ in range(200)] + [5.0]
+    for step in (False, True):
+        expected = [d.interpolate(request, step) for request in requests]
+        assert d.interpolate_many(iter(requests), step) == expected
+    with pytest.raises(KeyError):
+        NearestDict().interpolate_many([0])
+
+
+def test_interpolate_many_numpy():
+    numpy = pytest.importorskip('numpy')
+    random.seed(0)
+    d = NearestDict((float(key), random.random()) for key in range(100))
+    requests = [random.uniform(-10, 110) for _ in range(200)] + [5.0]
+    for step in (False, True):
+        expected = [d.interpolate(request, step) for request in requests]
+        result = d.interpolate_many(numpy.array(requests), step)
+        assert isinstance(result, numpy.ndarray)
+        assert numpy.allclose(result, expected)
+
+
+def test_delete_range():
+    random.seed(0)
+    for _ in range(100):
+        d = NearestDict((random.randrange(200), None) for _ in range(100))
+        d._list._reset(4)
+        minimum = random.choice([None, random.randrange(-10, 210)])
+        maximum = random.choice([None, random.randrange(-10, 210)])
+        inclusive = (random.random() < 0.5, random.random() < 0.5)
+        keys = list(d.irange(minimum, maximum, inclusive))
+        assert d.delete_range(minimum, maximum, inclusive) == len(keys)
+        assert not any(key in d for key in keys)
+        assert list(d.irange(minimum, maximum, inclusive)) == []
+        d._check()
+
+
+def test_truncate():
+    d = NearestDict.fromkeys(range(100))
+    assert d.truncate_before(10) == 10
+    assert d.truncate_after(89) == 10
+    assert list(d) == list(range(10, 90))
+    assert d.truncate_before(5) == 0
+    assert d.delete_range() == 80
+    assert not d
+    d._check()
+
+
+class CheckedDict(NearestDict):
+    validate_pickle = True
+
+
+def test_pickle():
+    d = CheckedDict.fromkeys(range(100))
+    d.rounding = NearestDict.NEAREST_NEXT
+    d._list._reset(4)
+    copy = pickle.loads(pickle.dumps(d))
+    assert copy == d
+    assert copy.rounding == NearestDict.NEAREST_NEXT
+    assert copy._list._lists == d._list._lists
+    assert copy.nearest_key(10.5) == 11
+    copy._check()
+    with pytest.raises(ValueError):
+        CheckedDict().__setstate__(({0: 0, 1: 1}, (1000, [[1, 0]], None)))
+    with pytest.raises(ValueError):
+        CheckedDict().__setstate__(({0: 0}, (1000, [[0, 0]], None)))
+
+
+def test_from_sorted():
+    pairs = [(key, str(key)) for key in range(0, 100, 10)]
+    d = NearestDict.from_sorted(
+        pairs, validate=True, rounding=NearestDict.NEAREST_PREV
+    )
+    assert d.nearest_key(19) == 10
+    assert list(d.items()) == pairs
+    d._check()
+    with pytest.raises(ValueError):
+        NearestDict.from_sorted(pairs[::-1], validate=True)
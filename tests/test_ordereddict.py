@@ -51,6 +51,21 @@ def test_iter_reversed():
     od._check()
 
 
+def test_iter_chunks():
+    od = OrderedDict.fromkeys(range(2500))
+    od._nums._reset(1000)
+    chunks = list(od.iter_chunks())
+    assert sum(chunks, []) == list(range(2500))
+    lengths = list(map(len, od._nums._list._lists))
+    assert [len(chunk) for chunk in chunks] == lengths
+    chunks = list(od.iter_chunks(1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert sum(chunks, []) == list(range(2500))
+    assert list(OrderedDict().iter_chunks()) == []
+    with pytest.raises(ValueError):
+        od.iter_chunks(0)
+
+
 def test_clear():
     od = OrderedDict(pairs)
     assert len(od) == 10
@@ -95,6 +110,39 @@ def test_values():
     od._check()
 
 
+def test_slice_view():
+    od = OrderedDict(zip('abcdefghij', range(10)))
+    keys = od.keys()[2:8]
+    assert len(keys) == 6
+    assert keys == list('cdefgh')
+    assert keys == tuple('cdefgh')
+    assert keys != list('cdefg')
+    assert keys != 'cdefgh'
+    assert keys[1] == 'd'
+    assert keys[-1] == 'h'
+    assert keys[1:4] == ['d', 'e', 'f']
+    assert keys[::2][1:] == ['e', 'g']
+    assert list(reversed(keys)) == list('hgfedc')
+    assert list(reversed(keys[::2])) == ['g', 'e', 'c']
+    assert keys[3:1] == []
+    assert list(reversed(keys[3:1])) == []
+    assert od.values()[::-3] == [9, 6, 3, 0]
+    assert od.items()[-2:] == [('i', 8), ('j', 9)]
+    assert repr(od.values()[:2]) == 'SliceView([0, 1])'
+    with pytest.raises(TypeError):
+        hash(keys)
+    del od['c']
+    assert keys == list('defghi')
+    for key in 'defghi':
+        del od[key]
+    assert len(keys) == 1
+    assert list(keys) == ['j']
+    assert keys[-1] == 'j'
+    assert keys[::-1] == ['j']
+    with pytest.raises(IndexError):
+        keys[1]
+
+
 def test_iloc():
     od = OrderedDict(enumerate(range(10)))
     iloc = od.keys()
@@ -146,6 +194,26 @@ def test_reduce():
     assert od == copy
 
 
+class CheckedDict(OrderedDict):
+    validate_pickle = True
+
+
+def test_reduce_layout():
+    od = CheckedDict(enumerate('abcde'))
+    od.move_to_end(0, last=False)
+    od.move_to_end(1)
+    copy = pickle.loads(pickle.dumps(od))
+    assert type(copy) is CheckedDict
+    assert list(copy.items()) == list(od.items())
+    copy._check()
+    copy[5] = 'f'
+    assert copy.keys()[-1] == 5
+    with pytest.raises(ValueError):
+        CheckedDict().__setstate__(([0, 1], ['a']))
+    with pytest.raises(ValueError):
+        CheckedDict().__setstate__(([0, 0], ['a', 'b']))
+
+
 def test_copy():
     od = OrderedDict(enumerate(range(10)))
     copy = od.copy()
@@ -164,3 +232,111 @@ def test_equality():
     assert od != {}
     assert od != OrderedDict()
     od._check()
+
+
+def test_move_to_end():
+    od = OrderedDict.fromkeys('abcde')
+    od.move_to_end('a')
+    assert ''.join(od) == 'bcdea'
+    od.move_to_end('a')
+    assert ''.join(od) == 'bcdea'
+    od.move_to_end('e', last=False)
+    assert ''.join(od) == 'ebcda'
+    od.move_to_end('e', last=False)
+    assert ''.join(od) == 'ebcda'
+    assert od.keys()[0] == 'e'
+    with pytest.raises(KeyError):
+        od.move_to_end('z')
+    od._check()
+
+
+def test_move_to_index():
+    keys = list(range(20))
+    od = OrderedDict.fromkeys(keys)
+    for step in range(500):
+        key = (step * 7) % 20
+        index = (step * 13) % 20 - 10
+        od.move_to_index(key, index)
+        keys.remove(key)
+        keys.insert(index if index >= 0 else index + 20, key)
+        assert list(od) == keys
+        assert od.keys()[index] == key
+    od._check()
+
+
+def test_move_to_index_renumber():
+    od = OrderedDict.fromkeys(range(10))
+    for _ in range(100):
+        od.move_to_index(9, 2)
+        od.move_to_index(3, 2)
+        assert list(od)[:4] == [0, 1, 3, 9]
+        od._check()
+    od[10] = None
+    assert od.keys()[-1] == 10
+    od._check()
+
+
+def test_move_to_index_errors():
+    od = OrderedDict.fromkeys('abc')
+    with pytest.raises(KeyError):
+        od.move_to_index('z', 0)
+    with pytest.raises(IndexError):
+        od.move_to_index('a', 3)
+    with pytest.raises(IndexError):
+        od.move_to_index('a', -4)
+    od.move_to_index('a', -1)
+    assert list(od) == ['b', 'c', 'a']
+    od._check()
+
+
+class SmallOrderedDict(OrderedDict):
+    compact_threshold = 8
+
+
+def test_compact():
+    od = OrderedDict.fromkeys(range(10))
+    for key in range(0, 10, 2):
+        del od[key]
+    od.compact()
+    assert list(od) == [1, 3, 5, 7, 9]
+    assert sorted(od._keys.values()) == list(range(5))
+    od[10] = None
+    assert od._keys[10] == 5
+    assert od.keys()[-1] == 10
+    od._check()
+
+
+def test_compact_auto():
+    od = SmallOrderedDict()
+    for key in range(1000):
+        od[key] = key
+        if len(od) > 3:
+            od.popitem(last=False)
+        assert max(od._keys.values()) < 8
+        od._check()
+    assert list(od) == [997, 998, 999]
+
+
+def test_compact_move():
+    od = SmallOrderedDict.fromkeys('abcd')
+    for _ in range(20):
+        od.move_to_end(od.keys()[0])
+        assert max(od._keys.values()) < 8
+        od.move_to_end(od.keys()[-1], last=False)
+        assert -8 < min(od._keys.values())
+        od._check()
+    assert list(od) == ['a', 'b', 'c', 'd']
+    for _ in range(20):
+        od.move_to_end(od.keys()[-1], last=False)
+        assert -8 < min(od._keys.values())
+        od._check()
+    assert list(od) == ['a', 'b', 'c', 'd']
+
+
+def test_from_sorted():
+    od = OrderedDict.from_sorted([('b', 1), ('a', 2), ('b', 3)], validate=True)
+    assert list(od.items()) == [('b', 3), ('a', 2)]
+    assert od == OrderedDict([('b', 1), ('a', 2), ('b', 3)])
+    od['c'] = 4
+    assert od.keys()[-1] == 'c'
+    od._check()
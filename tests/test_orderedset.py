@@ -1,5 +1,6 @@
 "Test sortedcollections.OrderedSet."
 
+import pickle
 import random
 
 import pytest
@@ -38,6 +39,15 @@ def test_reversed():
     assert list(reversed(os)) == list(reversed(names))
 
 
+def test_iter_chunks():
+    os = OrderedSet(range(2500))
+    os._nums._reset(1000)
+    chunks = list(os.iter_chunks())
+    assert sum(chunks, []) == list(range(2500))
+    assert len(chunks) == len(os._nums._list._lists)
+    assert list(os.iter_chunks(2000))[-1] == list(range(2000, 2500))
+
+
 def test_getitem():
     values = list(range(100))
     random.shuffle(values)
@@ -56,6 +66,12 @@ def test_index():
         assert values.index(value) == os.index(value)
 
 
+def test_index_after_discard():
+    os = OrderedSet('abcde')
+    os.discard('b')
+    assert os.index('d') == 2
+
+
 def test_index_error():
     os = OrderedSet(range(10))
     with pytest.raises(ValueError):
@@ -83,3 +99,188 @@ def test_discard():
 def test_repr():
     os = OrderedSet()
     assert repr(os) == 'OrderedSet([])'
+
+
+class SmallOrderedSet(OrderedSet):
+    compact_threshold = 8
+
+
+def test_compact():
+    os = OrderedSet(range(10))
+    for value in range(0, 10, 2):
+        os.discard(value)
+    os.compact()
+    assert list(os) == [1, 3, 5, 7, 9]
+    assert sorted(os._keys.values()) == list(range(5))
+    os.add(10)
+    assert os[-1] == 10
+
+
+def test_compact_auto():
+    os = SmallOrderedSet()
+    for value in range(1000):
+        os.add(value)
+        if len(os) > 3:
+            os.discard(os[0])
+        assert max(os._keys.values()) < 8
+    assert list(os) == [997, 998, 999]
+    os._nums._check()
+
+
+def test_update():
+    os = OrderedSet('abc')
+    os |= 'cdbe'
+    assert list(os) == list('abcde')
+    assert os.update(range(50), 'z') is None
+    assert list(os)[:6] == list('abcde') + [0]
+    assert os[-1] == 'z'
+    os._nums._check()
+    assert os.union('xa', 'y') == set(os) | {'x', 'y'}
+    assert list(os | 'x')[-1] == 'x'
+    os |= 'xy'
+    assert list(os)[-2:] == ['x', 'y']
+
+
+def test_intersection():
+    os = OrderedSet('abcdef')
+    os &= 'fedcb'
+    assert list(os) == list('bcdef')
+    assert os.intersection_update('bcdef') is None
+    assert list(os) == list('bcdef')
+    os.intersection_update('dcb', 'xbd')
+    assert list(os) == ['b', 'd']
+    os._nums._check()
+    os = OrderedSet(range(100))
+    os &= range(99)
+    assert 99 not in os
+    assert list(OrderedSet('abc').intersection()) == list('abc')
+    assert list(OrderedSet('abcd') & 'dbx') == ['b', 'd']
+
+
+def test_difference():
+    os = OrderedSet(range(100))
+    os -= [50, 200]
+    assert len(os) == 99
+    assert 50 not in os
+    assert os.difference_update(range(0, 100, 2), [1]) is None
+    assert list(os) == list(range(3, 100, 2))
+    os._nums._check()
+    assert list(os - range(10)) == list(range(11, 100, 2))
+    assert list(os.difference([3], [5])) == list(range(7, 100, 2))
+    os -= os
+    assert not os
+
+
+def test_symmetric_difference():
+    os = OrderedSet(range(100))
+    os ^= [5, 200]
+    assert 5 not in os
+    assert os[-1] == 200
+    assert os.symmetric_difference_update(range(50, 150)) is None
+    assert list(os) == [v for v in range(50) if v != 5] + [200] + list(
+        range(100, 150)
+    )
+    os._nums._check()
+    assert list(OrderedSet('abc') ^ 'dcx') == list('abdx')
+    os ^= os
+    assert not os
+
+
+def test_clear():
+    os = OrderedSet('abc')
+    os.clear()
+    assert not os
+    os.add('d')
+    assert list(os) == ['d']
+
+
+def test_getitem_slice():
+    os = OrderedSet('abcdef')
+    assert os[1:5:2] == ['b', 'd']
+
+
+def test_pop():
+    os = OrderedSet('abcde')
+    assert os.pop() == 'e'
+    assert os.pop(0) == 'a'
+    assert os.pop(-2) == 'c'
+    assert list(os) == ['b', 'd']
+    assert 'c' not in os
+    with pytest.raises(IndexError):
+        os.pop(5)
+    os.pop()
+    os.pop()
+    with pytest.raises(IndexError):
+        os.pop()
+
+
+def test_delitem():
+    os = OrderedSet(range(100))
+    del os[0]
+    del os[-1]
+    del os[:10]
+    del os[-10:]
+    del os[::2]
+    assert list(os) == list(range(12, 89, 2))
+    assert 11 not in os
+    assert os.index(14) == 1
+    os._nums._check()
+    del os[:]
+    assert not os and not os._keys
+
+
+def test_insert():
+    os = OrderedSet('bdf')
+    os.insert(0, 'a')
+    os.insert(2, 'c')
+    os.insert(-1, 'e')
+    os.insert(100, 'g')
+    os.insert(-100, '_')
+    os.insert(3, 'a')
+    assert ''.join(os) == '_abcdefg'
+    assert [os.index(value) for value in os] == list(range(8))
+    os._nums._check()
+
+
+def test_insert_renumber():
+    os = SmallOrderedSet('ab')
+    for value in range(100):
+        os.insert(1, value)
+        os.insert(0, -value - 1)
+        assert os[2] == value
+        assert os[0] == -value - 1
+    assert len(os) == 202
+    assert os[-1] == 'b'
+    os._nums._check()
+    os = SmallOrderedSet('ab')
+    for value in range(100):
+        os.insert(-1, value)
+    assert list(os) == ['a'] + list(range(100)) + ['b']
+    os._nums._check()
+    os = SmallOrderedSet()
+    for value in range(20):
+        os.insert(len(os), value)
+    assert list(os) == list(range(20))
+
+
+class CheckedSet(OrderedSet):
+    validate_pickle = True
+
+
+def test_pickle():
+    os = CheckedSet('abcde')
+    os.insert(0, 'z')
+    copy = pickle.loads(pickle.dumps(os))
+    assert type(copy) is CheckedSet
+    assert list(copy) == list(os)
+    copy.add('y')
+    assert copy[-1] == 'y'
+    with pytest.raises(ValueError):
+        CheckedSet().__setstate__(['a', 'a'])
+
+
+def test_from_sorted():
+    os = OrderedSet.from_sorted('edcbae')
+    assert list(os) == list('edcba')
+    os.add('f')
+    assert os.index('f') == 5
@@ -1,6 +1,7 @@
 "Test sortedcollections.recipes"
 
 import pickle
+import random
 
 import pytest
 
@@ -14,12 +15,46 @@ def test_index_dict():
         assert iloc[value] == value
 
 
+def test_index_dict_no_delete_range():
+    # Keys are ordered by hash so ranges of keys are meaningless.
+    temp = IndexableDict.fromkeys('abcdefghij')
+    assert not hasattr(temp, 'delete_range')
+    assert not hasattr(temp, 'truncate_before')
+
+
+def test_index_dict_choice_sample():
+    mapping = IndexableDict.fromkeys(range(100))
+    rng = random.Random(0)
+    assert mapping.choice(rng) in mapping
+    assert mapping.choice() in mapping
+    small = mapping.sample(5, rng)
+    assert len(set(small)) == 5
+    assert set(small) <= set(mapping)
+    large = mapping.sample(100)
+    assert sorted(large) == list(range(100))
+    for k in (5, 50):
+        expected = random.Random(1).sample(range(100), k)
+        expected = [mapping.keys()[pos] for pos in expected]
+        assert mapping.sample(k, random.Random(1)) == expected
+    with pytest.raises(ValueError):
+        mapping.sample(101)
+    with pytest.raises(IndexError):
+        IndexableDict().choice()
+
+
 def test_index_set():
     set_values = IndexableSet(range(10))
     for index in range(10):
         assert set_values[index] == index
 
 
+def test_index_set_choice_sample():
+    set_values = IndexableSet(range(10))
+    assert set_values.choice() in set_values
+    assert sorted(set_values.sample(10)) == list(range(10))
+    assert set_values.sample(0) == []
+
+
 def test_index_set_pickle():
     set_values1 = IndexableSet(range(10))
     data = pickle.dumps(set_values1)
@@ -27,6 +62,52 @@ def test_index_set_pickle():
     assert set_values1 == set_values2
 
 
+class CheckedSet(IndexableSet):
+    validate_pickle = True
+
+
+def test_index_set_pickle_layout():
+    set_values = CheckedSet(map(str, range(100)))
+    set_values._list._reset(4)
+    copy = pickle.loads(pickle.dumps(set_values))
+    assert list(copy) == list(set_values)
+    assert copy._list._lists == set_values._list._lists
+    copy._check()
+    lists = [sorted(set_values, key=hash, reverse=True)]
+    copy = CheckedSet()
+    copy.__setstate__((4, lists, None))
+    assert copy == set_values
+    copy._check()
+    with pytest.raises(ValueError):
+        CheckedSet().__setstate__((1000, [['a', 'a']], None))
+
+
+class CheckedDict(IndexableDict):
+    validate_pickle = True
+
+
+def test_index_dict_pickle_layout():
+    mapping = CheckedDict.fromkeys(map(str, range(100)))
+    copy = pickle.loads(pickle.dumps(mapping))
+    assert list(copy) == list(mapping)
+    copy._check()
+    with pytest.raises(ValueError):
+        CheckedDict().__setstate__(({}, (1000, [['a']], None)))
+
+
+def test_segment_list_pickle():
+    sl = SegmentList(range(100))
+    sl._reset(4)
+    sl.insert(50, 'x')
+    copy = pickle.loads(pickle.dumps(sl))
+    assert list(copy) == list(sl)
+    assert copy._lists == sl._lists
+    assert copy._load == 4
+    copy._check()
+    with pytest.raises(ValueError):
+        SegmentList().__setstate__((1000, [[0], []]))
+
+
 def test_segment_list():
     values = [5, 1, 3, 2, 4, 8, 6, 7, 9, 0]
     sl = SegmentList(values)
@@ -46,6 +127,138 @@ def test_segment_list():
     sl.insert(3, 'd')
     sl.insert(6, 'e')
     assert list(sl) == [0, 1, 'c', 'd', 3, 4, 'e']
+    sl._check()
+
+
+def test_segment_list_search():
+    sl = SegmentList()
+    sl._reset(4)
+    sl.extend([3, 1, 4, 1, 5, 9, 2, 6, 5, 3, 5, 8, 9, 7, 9, 3])
+    sl._check()
+    assert 7 in sl
+    assert 10 not in sl
+    assert sl.count(5) == 3
+    assert sl.count(0) == 0
+    assert sl.index(5) == 4
+    assert sl.index(5, 5) == 8
+    assert sl.index(5, -6) == 10
+    assert sl.index(9, 6, 13) == 12
+    with pytest.raises(ValueError):
+        sl.index(9, 6, 12)
+    with pytest.raises(ValueError):
+        sl.index(10)
+    with pytest.raises(ValueError):
+        sl.index(7, 0, 2)
+    sl.remove(9)
+    sl.discard(9)
+    sl.discard(10)
+    with pytest.raises(ValueError):
+        sl.remove(10)
+    assert list(sl) == [3, 1, 4, 1, 5, 2, 6, 5, 3, 5, 8, 7, 9, 3]
+    sl._check()
+    sl[-1] = 0
+    assert sl._maxes[-1] == 0
+    assert repr(sl[:3]) == '[3, 1, 4]'
+    assert repr(SegmentList('ab')) == "SegmentList(['a', 'b'])"
+
+
+def test_segment_list_index_positions():
+    sl = SegmentList()
+    sl._reset(4)
+    for value in range(100):
+        sl.insert(value // 2, value)
+    sl[0] = sl[0]
+    sl._check()
+    expected = []
+    for value in range(100):
+        expected.insert(value // 2, value)
+    assert list(sl) == expected
+    assert [sl.index(value) for value in range(100)] == [
+        expected.index(value) for value in range(100)
+    ]
+    while sl:
+        del sl[len(sl) // 3]
+        sl._check()
+
+
+def test_segment_list_bulk():
+    sl = SegmentList()
+    sl._reset(4)
+    sl.extend(range(3))
+    sl.extend(range(3, 20))
+    assert list(map(len, sl._lists)) == [4, 4, 4, 4, 4]
+    sl._check()
+    assert sl[17] == 17
+    sl.extend(range(20, 30))
+    sl._check()
+    assert list(sl) == list(range(30))
+    sl.extend(iter(range(30, 31)))
+    del sl[1]
+    sl.extend(range(31, 41))
+    sl._check()
+    assert list(sl) == [0] + list(range(2, 41))
+    lengths = list(map(len, sl._lists))
+    sl.reverse()
+    sl._check()
+    assert list(sl) == list(range(40, 1, -1)) + [0]
+    assert sl[5] == 35
+    assert sl._maxes[-1] == 0
+    expected = sorted(sl, key=lambda value: value % 10)
+    sl.sort(key=lambda value: value % 10)
+    sl._check()
+    assert list(sl) == expected
+    sl.sort(reverse=True)
+    assert list(sl) == list(range(40, 1, -1)) + [0]
+    assert sorted(map(len, sl._lists)) == sorted(lengths)
+    sl._check()
+
+
+def test_segment_list_split():
+    for index in range(-25, 25):
+        sl = SegmentList()
+        sl._reset(4)
+        sl.extend(range(20))
+        blocks = list(sl._lists)
+        left, right = sl.split(index)
+        expected = list(range(20))
+        assert list(left) == expected[:index]
+        assert list(right) == expected[index:]
+        assert not sl
+        left._check()
+        right._check()
+        sl._check()
+        ids = set(map(id, blocks))
+        shared = [id(block) in ids for block in left._lists + right._lists]
+        assert sum(shared) >= len(blocks) - 1
+    left, right = SegmentList().split(0)
+    assert not left and not right
+
+
+def test_segment_list_concat():
+    sl = SegmentList()
+    sl._reset(4)
+    sl.extend(range(10))
+    other = SegmentList()
+    other._reset(4)
+    other.extend(range(10, 20))
+    block = other._lists[0]
+    sl.concat(other)
+    assert list(sl) == list(range(20))
+    assert any(values is block for values in sl._lists)
+    assert not other
+    assert sl[12] == 12
+    sl._check()
+    other._check()
+    sl.concat(sl)
+    assert list(sl) == list(range(20)) * 2
+    sl.concat(SegmentList(range(3)))
+    assert list(sl)[-4:] == [19, 0, 1, 2]
+    sl._check()
+    sl += sl
+    assert len(sl) == 86
+    sl += range(2)
+    assert list(sl)[-3:] == [2, 0, 1]
+    sl._check()
 
 
 def test_segment_list_bisect():
@@ -56,5 +269,54 @@ def test_segment_list_bisect():
 
 def test_segment_list_setitem_slice():
     sl = SegmentList()
-    with pytest.raises(NotImplementedError):
-        sl[:] = [0]
+    sl[:] = [0]
+    assert list(sl) == [0]
+    sl = SegmentList(range(10))
+    sl[::3] = 'abcd'
+    assert list(sl) == ['a', 1, 2, 'b', 4, 5, 'c', 7, 8, 'd']
+    with pytest.raises(ValueError):
+        sl[::3] = 'ab'
+    sl[8:2] = 'xy'
+    assert list(sl)[7:11] == [7, 'x', 'y', 8]
+    sl._check()
+
+
+def test_segment_list_splice_blocks():
+    sl = SegmentList(range(10000))
+    for _ in range(2000):
+        sl[5:6] = 'ab'
+    assert len(sl) == 12000
+    assert len(sl._lists) <= 12000 // (sl._load // 2)
+    for _ in range(200):
+        del sl[100:110]
+    assert len(sl._lists) <= len(sl) // (sl._load // 2)
+    sl._check()
+
+
+def test_segment_list_slices_random():
+    random.seed(0)
+    sl = SegmentList()
+    sl._reset(4)
+    expected = []
+    for step in range(500):
+        start = random.randrange(len(expected) + 1)
+        stop = random.randrange(start, len(expected) + 1)
+        if random.random() < 0.3:
+            del sl[start:stop]
+            del expected[start:stop]
+        else:
+            values = [step] * random.randrange(20)
+            sl[start:stop] = values
+            expected[start:stop] = values
+        assert list(sl) == expected
+        assert len(sl) == len(expected)
+        if expected:
+            index = random.randrange(len(expected))
+            assert sl[index] == expected[index]
+        sl._check()
+    del sl[::2]
+    del expected[::2]
+    assert list(sl) == expected
+    del sl[5:5]
+    del sl[:]
+    assert not sl
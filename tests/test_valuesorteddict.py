@@ -11,6 +11,10 @@ def identity(value):
     return value
 
 
+def negate(value):
+    return -value
+
+
 alphabet = 'abcdefghijklmnopqrstuvwxyz'
 
 
@@ -96,3 +100,305 @@ def test_update():
     for index, letter in enumerate(alphabet):
         pair = {index: letter}
         temp.update(pair)
+
+
+def test_update_bulk():
+    temp = ValueSortedDict(enumerate(reversed(alphabet)))
+    temp._reset(4)
+    temp.update((index, letter) for index, letter in enumerate(alphabet))
+    assert list(temp) == list(range(26))
+    temp.update({0: 'zz', 1: 'aa'}, **{'new': 'm'})
+    assert temp.keys()[0] == 1
+    assert temp.keys()[-1] == 0
+    assert temp.keys()[12] == 'new'
+    temp._check()
+
+
+def test_update_bulk_func():
+    temp = ValueSortedDict(negate, enumerate(range(10)))
+    temp.update({20: 5, 21: 5, 0: 100})
+    assert list(temp) == [0, 9, 8, 7, 6, 5, 20, 21, 4, 3, 2, 1]
+    temp._check()
+
+
+def test_update_small():
+    temp = ValueSortedDict(enumerate(range(100)))
+    temp.update({0: 1000})
+    assert temp.keys()[-1] == 0
+    temp._check()
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, value):
+        self.calls += 1
+        return -value
+
+
+def test_cache_keys():
+    func = Counter()
+    temp = ValueSortedDict(func, enumerate(range(10)), cache_keys=True)
+    assert func.calls == 10
+    temp[0] = -1
+    assert func.calls == 11
+    assert list(temp)[-1] == 0
+    del temp[0]
+    assert temp.pop(1) == 1
+    assert temp.pop(1, 'missing') == 'missing'
+    with pytest.raises(KeyError):
+        temp.pop(1)
+    assert temp.popitem() == (2, 2)
+    assert temp.setdefault(3) == 3
+    assert temp.setdefault(20, 20) == 20
+    assert temp.keys()[0] == 20
+    temp.update({4: 40})
+    assert temp.keys()[0] == 4
+    temp.update({index: index for index in range(100)})
+    assert func.calls == 113
+    assert temp._sort_keys == {key: -value for key, value in temp.items()}
+    temp._check()
+    temp.clear()
+    assert not temp._sort_keys
+
+
+def test_cache_keys_copy():
+    temp = ValueSortedDict(negate, enumerate(range(10)), cache_keys=True)
+    that = temp.copy()
+    assert that == temp
+    assert that._sort_keys == temp._sort_keys
+    that = pickle.loads(pickle.dumps(temp))
+    assert that == temp
+    assert list(that) == list(temp)
+    assert that._sort_keys == temp._sort_keys
+
+
+def test_cache_keys_no_func():
+    temp = ValueSortedDict(enumerate(range(10)), cache_keys=True)
+    assert temp._sort_keys is None
+    assert temp.pop(0) == 0
+    assert temp.popitem() == (9, 9)
+    temp.clear()
+    assert pickle.loads(pickle.dumps(temp)) == temp
+
+
+def test_cache_keys_view_delete():
+    temp = ValueSortedDict(negate, enumerate(range(10)), cache_keys=True)
+    del temp.keys()[:3]
+    assert len(temp._sort_keys) == 7
+    del temp.items()[0]
+    del temp.values()[-1]
+    assert list(temp) == [5, 4, 3, 2, 1]
+    assert temp._sort_keys == {key: -value for key, value in temp.items()}
+    temp._check()
+    temp = ValueSortedDict(negate, enumerate(range(10)))
+    del temp.keys()[:3]
+    assert list(temp) == [6, 5, 4, 3, 2, 1, 0]
+
+
+def test_irange_value():
+    temp = ValueSortedDict(enumerate(reversed(range(100))))
+    assert list(temp.irange_value(10, 12)) == [89, 88, 87]
+    assert list(temp.irange_value(10, 12, (False, False))) == [88]
+    assert list(temp.irange_value(maximum=1, reverse=True)) == [98, 99]
+    assert list(temp.irange_value(97)) == [2, 1, 0]
+    assert list(temp.irange_value(200)) == []
+
+
+def test_irange_value_func():
+    temp = ValueSortedDict(negate, enumerate(range(100)))
+    assert list(temp.irange_value(12, 10)) == [12, 11, 10]
+    assert list(temp.irange_value(12, 10, reverse=True)) == [10, 11, 12]
+
+
+def test_bisect_value():
+    temp = ValueSortedDict(negate, [('a', 1), ('b', 2), ('c', 2), ('d', 3)])
+    assert temp.bisect_value_left(2) == 1
+    assert temp.bisect_value_right(2) == 3
+    assert temp.bisect_value_left(0) == 4
+    assert temp.bisect_value_right(10) == 0
+
+
+def test_count_values_between():
+    temp = ValueSortedDict(zip(alphabet, [1, 2, 2, 3, 3, 3, 4]))
+    assert temp.count_values_between() == 7
+    assert temp.count_values_between(2, 3) == 5
+    assert temp.count_values_between(2, 3, (False, True)) == 3
+    assert temp.count_values_between(2, 3, (True, False)) == 2
+    assert temp.count_values_between(maximum=2) == 3
+    assert temp.count_values_between(minimum=4) == 1
+    assert temp.count_values_between(3, 2) == 0
+
+
+def test_rank():
+    temp = ValueSortedDict(negate, enumerate(range(100)))
+    temp._reset(4)
+    for key in range(100):
+        assert temp.rank(key) == 99 - key
+    temp.update({key: 0 for key in range(50)})
+    for key in range(50):
+        assert temp.rank(key) == 50 + key
+    with pytest.raises(KeyError):
+        temp.rank(100)
+
+
+def test_percentile():
+    temp = ValueSortedDict(enumerate(range(101)))
+    assert temp.percentile(0) == 0
+    assert temp.percentile(12.5) == 12
+    assert temp.percentile(100) == 100
+    with pytest.raises(ValueError):
+        temp.percentile(101)
+    with pytest.raises(IndexError):
+        ValueSortedDict().percentile(50)
+
+
+def test_top_bottom():
+    temp = ValueSortedDict(zip(alphabet, range(26)))
+    assert temp.top(3) == [('z', 25), ('y', 24), ('x', 23)]
+    assert temp.bottom(2) == [('a', 0), ('b', 1)]
+    assert len(temp.top(100)) == 26
+    assert len(temp.bottom(100)) == 26
+    assert temp.top(0) == temp.bottom(0) == []
+    assert temp.top(-1) == temp.bottom(-1) == []
+
+
+def test_increment():
+    temp = ValueSortedDict(negate, cache_keys=True)
+    temp._reset(4)
+    values = dict.fromkeys(range(100), 0)
+    temp.update(values)
+    for step in range(500):
+        key = (step * 37) % 103
+        delta = (step * 7) % 11 - 5
+        values[key] = values.get(key, 0) + delta
+        assert temp.increment(key, delta) == values[key]
+        temp._check()
+    assert temp == values
+    assert temp._sort_keys == {key: -value for key, value in values.items()}
+    ordered = [temp[key] for key in temp]
+    assert ordered == sorted(values.values(), reverse=True)
+
+
+def test_increment_in_place():
+    temp = ValueSortedDict(enumerate([0, 10, 20]))
+    assert temp.increment(0) == 1
+    assert temp.increment(2, -5) == 15
+    assert temp.increment(1, -10) == 0
+    assert list(temp) == [1, 0, 2]
+    temp._check()
+
+
+def test_increment_many():
+    temp = ValueSortedDict(enumerate(range(100)))
+    temp.increment_many({0: 1000, 1: 500})
+    assert temp.keys()[-2:] == [1, 0]
+    temp.increment_many([(200, 1), (200, -2), (5, -10)] * 10)
+    assert temp[200] == -10
+    assert temp[5] == -95
+    assert temp.keys()[:2] == [5, 200]
+    temp.increment_many((key, -key) for key in range(100))
+    assert temp.keys()[:2] == [5, 200]
+    temp._check()
+
+
+def test_delete_range():
+    temp = ValueSortedDict((key, key % 50) for key in range(200))
+    temp._list._reset(4)
+    assert temp.delete_range(40, 30) == 0
+    assert temp.delete_range(10, 40, inclusive=(False, True)) == 4 * 30
+    assert all(not 10 < value <= 40 for value in temp.values())
+    temp._check()
+    assert temp.truncate_before(5) == 20
+    assert temp.truncate_after(45) == 16
+    values = list(range(5, 11)) + list(range(41, 46))
+    assert sorted(set(temp.values())) == values
+    temp._check()
+
+
+def test_delete_range_cache_keys():
+    temp = ValueSortedDict(negate, enumerate(range(100)), cache_keys=True)
+    temp._list._reset(4)
+    assert temp.delete_range(maximum=90) == 10
+    assert temp.delete_range(minimum=9) == 10
+    assert temp.truncate_after(20) == 10
+    assert temp._sort_keys == {key: -key for key in range(20, 90)}
+    temp._check()
+    assert temp.delete_range() == 70
+    assert not temp._sort_keys
+
+
+calls = []
+
+
+def counted_negate(value):
+    calls.append(value)
+    return -value
+
+
+class CheckedDict(ValueSortedDict):
+    validate_pickle = True
+
+
+def test_pickle_layout():
+    for cache_keys in (False, True):
+        temp = ValueSortedDict(
+            counted_negate, enumerate(range(100)), cache_keys=cache_keys
+        )
+        temp._list._reset(4)
+        del calls[:]
+        that = pickle.loads(pickle.dumps(temp))
+        assert not calls
+        assert that == temp
+        assert that._list._lists == temp._list._lists
+        assert that._sort_keys == temp._sort_keys
+        assert that._list._load == 4
+        that._check()
+
+
+def test_pickle_validate():
+    temp = CheckedDict(negate, enumerate(range(10)), cache_keys=True)
+    that = pickle.loads(pickle.dumps(temp))
+    assert type(that) is CheckedDict
+    assert list(that) == list(temp)
+    that._check()
+    that = pickle.loads(pickle.dumps(CheckedDict(enumerate('cba'))))
+    assert list(that) == [2, 1, 0]
+    mapping = dict(enumerate(range(4)))
+    states = [
+        ({}, (1000, [[3, 2, 1, 0]], [[-3, -2, -1, 0]])),
+        (mapping, (1000, [[0, 1, 2, 3]], [[0, -1, -2, -3]])),
+        (mapping, (1000, [[3, 2], [], [1, 0]], [[-3, -2], [], [-1, 0]])),
+        (mapping, (1000, [[3, 2, 1, 0]], [[-3, -2], [-1, 0]])),
+        (mapping, (1000, [[3, 2, 1, 0]], [[-3, -2, -1, 1]])),
+    ]
+    for state in states:
+        with pytest.raises(ValueError):
+            CheckedDict(negate).__setstate__(state)
+
+
+def test_from_sorted():
+    pairs = [(key, -value) for value, key in enumerate(alphabet)]
+    del calls[:]
+    temp = ValueSortedDict.from_sorted(negate, pairs, validate=True)
+    assert list(temp) == list(alphabet)
+    temp._check()
+    temp = ValueSortedDict.from_sorted(counted_negate, pairs, cache_keys=True)
+    assert len(calls) == 26
+    assert temp._sort_keys == {key: -value for key, value in pairs}
+    temp._check()
+    temp = ValueSortedDict.from_sorted(dict(zip(alphabet, range(26))))
+    assert temp.keys()[-1] == 'z'
+    temp._check()
+    with pytest.raises(ValueError):
+        ValueSortedDict.from_sorted(pairs, validate=True)
+
+
+def test_increment_ties():
+    temp = ValueSortedDict(a=1, b=2, c=2)
+    other = ValueSortedDict(temp)
+    temp.increment('a')
+    other['a'] = 2
+    assert list(temp) == list(other) == ['b', 'c', 'a']
+    temp._check()